@@ -0,0 +1,27 @@
+"""Drop indexes on low-cardinality columns
+
+Revision ID: 002_drop_low_cardinality_indexes
+Revises: 001_initial_schema
+Create Date: 2026-10-15 12:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '002_drop_low_cardinality_indexes'
+down_revision = '001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Drop http_status and risk_level indexes (no selectivity, extra cost on every INSERT)."""
+    op.drop_index('idx_api_requests_http_status', table_name='api_requests')
+    op.drop_index('idx_predictions_risk_level', table_name='predictions')
+
+
+def downgrade() -> None:
+    """Recreate http_status and risk_level indexes."""
+    op.create_index('idx_predictions_risk_level', 'predictions', ['risk_level'])
+    op.create_index('idx_api_requests_http_status', 'api_requests', ['http_status'])
@@ -131,9 +131,12 @@ def main():
         num_cols=num_cols,
         multi_list_col=None,  # No multi-valued columns in this dataset
         max_categories=30,
+        min_frequency=None,  # Keep every category, as in the deployed model
         multi_max_features=30,
         onehot_drop_binary=True,
-        onehot_sparse=True
+        onehot_sparse=True,
+        prep_n_jobs=1,  # The API predicts one employee at a time: no process pool at inference
+        fast_median=False,  # Keep the saved pipeline sklearn-only so the API can unpickle it
     )
 
     # Quick test to get feature names
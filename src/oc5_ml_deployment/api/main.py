@@ -8,31 +8,33 @@ a trained XGBoost model.
 import logging
 import time
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, status, Request, Depends
-from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import FastAPI, HTTPException, status, Request
+from pydantic import TypeAdapter
+from fastapi.responses import JSONResponse, HTMLResponse, ORJSONResponse, RedirectResponse
 
 from .model_service import get_model_service
 from .schemas import (
     BatchPredictionRequest,
     BatchPredictionResponse,
     BatchPredictionItem,
+    EmployeeBatchItem,
     EmployeeFeatures,
     ExplanationResponse,
     FeatureExplanation,
     HealthResponse,
     ModelInfoResponse,
+    PredictionMetadata,
     PredictionResponse,
     PredictionResult,
 )
 
 # Import database components (optional - works without database)
-from ..database import get_db, DATABASE_ENABLED
-from ..database import crud
+from ..database import DATABASE_ENABLED
+from ..database import writer
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +43,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Dumps all validated batch items in one pydantic-core call instead of one model_dump() per item
+_BATCH_ITEMS_ADAPTER = TypeAdapter(List[EmployeeBatchItem])
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -58,6 +63,7 @@ async def lifespan(app: FastAPI):
     # Check database
     if DATABASE_ENABLED:
         logger.info("Database logging is ENABLED")
+        await writer.start()
     else:
         logger.warning("Database logging is DISABLED - predictions will not be saved")
 
@@ -65,6 +71,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down API...")
+    await writer.stop()
 
 
 # Create FastAPI app
@@ -75,6 +82,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson: faster response encoding than stdlib json
 )
 
 
@@ -132,7 +140,7 @@ async def health_check():
         status="healthy" if is_loaded else "unhealthy",
         model_loaded=is_loaded,
         model_version=model_version,
-        timestamp=datetime.utcnow().isoformat() + "Z",
+        timestamp=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
     )
 
 
@@ -158,21 +166,17 @@ async def get_model_info():
 
 
 @app.post("/api/v1/predict", response_model=PredictionResponse, tags=["Predictions"])
-async def predict_single(
-    employee: EmployeeFeatures,
-    request: Request,
-    db: Optional[AsyncSession] = Depends(get_db)
-):
+async def predict_single(employee: EmployeeFeatures, request: Request):
     """
     Predict attrition for a single employee.
 
     Accepts employee features and returns prediction with probability
-    and risk level. Logs request and prediction to database if enabled.
+    and risk level. Queues request and prediction for database logging
+    if enabled (written in the background, off the response path).
 
     Args:
         employee: Employee features
         request: FastAPI request object (for metadata)
-        db: Database session (optional, depends on DATABASE_ENABLED)
 
     Returns:
         Prediction result with probabilities and metadata
@@ -197,39 +201,28 @@ async def predict_single(
 
         # Calculate prediction time
         prediction_time_ms = int((time.time() - start_time) * 1000)
-
-        # Log to database if enabled
-        if DATABASE_ENABLED and db is not None:
-            try:
-                # Create API request record
-                api_request = await crud.create_api_request(
-                    session=db,
-                    endpoint="/api/v1/predict",
-                    request_data=employee_data,
-                    client_ip=request.client.host if request.client else None,
-                    user_agent=request.headers.get("user-agent"),
-                    http_status=http_status_code,
-                    response_time_ms=prediction_time_ms
-                )
-
-                # Create prediction record
-                await crud.create_prediction(
-                    session=db,
-                    request_id=api_request.id,
-                    employee_id=employee_data.get("employee_id"),
-                    attrition_prob=prob_leave,
-                    risk_level=risk_level,
-                    model_version=model_service.metadata.get("model_version"),
-                    features_snapshot=employee_data
-                )
-
-                # Commit handled by get_db() dependency
-                logger.debug(f"Logged prediction to database: request_id={api_request.id}")
-            except Exception as db_error:
-                logger.error(f"Failed to log to database: {db_error}")
-                # Don't fail the request if database logging fails
-                # Must rollback here since we're suppressing the exception
-                await db.rollback()
+        now = datetime.now(timezone.utc)  # Shared by the database row and the response
+
+        # Queue for database logging if enabled (never blocks the response)
+        if DATABASE_ENABLED:
+            writer.enqueue(
+                api_request={
+                    "endpoint": "/api/v1/predict",
+                    "request_data": employee_data,
+                    "client_ip": request.client.host if request.client else None,
+                    "user_agent": request.headers.get("user-agent"),
+                    "http_status": http_status_code,
+                    "response_time_ms": prediction_time_ms,
+                },
+                predictions=[{
+                    "employee_id": employee_data.get("employee_id"),
+                    "attrition_prob": prob_leave / 100,  # Stored as 0-1, API returns percentage
+                    "risk_level": risk_level,
+                    "model_version": model_service.metadata.get("model_version"),
+                    "prediction_date": now,
+                    "features_snapshot": employee_data,
+                }],
+            )
 
         # Build response
         return PredictionResponse(
@@ -239,11 +232,11 @@ async def predict_single(
                 probability_stay=round(prob_stay, 2),
                 risk_level=risk_level,
             ),
-            metadata={
-                "model_version": model_service.metadata.get("model_version"),
-                "prediction_time_ms": prediction_time_ms,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            },
+            metadata=PredictionMetadata(
+                model_version=model_service.metadata.get("model_version"),
+                prediction_time_ms=prediction_time_ms,
+                timestamp=now.isoformat().replace("+00:00", "Z"),
+            ),
         )
 
     except ValueError as e:
@@ -257,21 +250,17 @@ async def predict_single(
 
 
 @app.post("/api/v1/predict/batch", response_model=BatchPredictionResponse, tags=["Predictions"])
-async def predict_batch(
-    batch_request: BatchPredictionRequest,
-    request: Request,
-    db: Optional[AsyncSession] = Depends(get_db)
-):
+async def predict_batch(batch_request: BatchPredictionRequest, request: Request):
     """
     Predict attrition for multiple employees.
 
     Accepts a list of employees (up to 100) and returns predictions
-    for each one. Logs all requests and predictions to database if enabled.
+    for each one. Queues the request and all predictions for database
+    logging if enabled (written in the background, off the response path).
 
     Args:
         batch_request: Batch prediction request with list of employees
         request: FastAPI request object (for metadata)
-        db: Database session (optional, depends on DATABASE_ENABLED)
 
     Returns:
         Batch prediction results with metadata
@@ -289,58 +278,42 @@ async def predict_batch(
 
     try:
         # Extract employee data
-        employees_data = []
-        employee_ids = []
-
-        for employee in batch_request.employees:
-            employee_dict = employee.model_dump()
-            employee_id = employee_dict.pop("employee_id")
-            employee_ids.append(employee_id)
-            employees_data.append(employee_dict)
+        employees_data = _BATCH_ITEMS_ADAPTER.dump_python(batch_request.employees)
+        employee_ids = [employee_dict.pop("employee_id") for employee_dict in employees_data]
 
         # Make batch predictions
         predictions = model_service.predict_batch(employees_data)
 
         # Calculate prediction time
         prediction_time_ms = int((time.time() - start_time) * 1000)
-
-        # Log to database if enabled
-        api_request_id = None
-        if DATABASE_ENABLED and db is not None:
-            try:
-                # Create API request record (one for the whole batch)
-                api_request = await crud.create_api_request(
-                    session=db,
-                    endpoint="/api/v1/predict/batch",
-                    request_data={"employee_count": len(employees_data)},
-                    client_ip=request.client.host if request.client else None,
-                    user_agent=request.headers.get("user-agent"),
-                    http_status=http_status_code,
-                    response_time_ms=prediction_time_ms
-                )
-                api_request_id = api_request.id
-
-                # Create prediction records (one for each employee)
-                for employee_id, employee_data, (will_leave, prob_leave, prob_stay, risk_level) in zip(
-                    employee_ids, employees_data, predictions
-                ):
-                    await crud.create_prediction(
-                        session=db,
-                        request_id=api_request.id,
-                        employee_id=employee_id,
-                        attrition_prob=prob_leave,
-                        risk_level=risk_level,
-                        model_version=model_service.metadata.get("model_version"),
-                        features_snapshot=employee_data
+        now = datetime.now(timezone.utc)  # Shared by the database rows and the response
+
+        # Queue for database logging if enabled (one API request for the whole batch)
+        if DATABASE_ENABLED:
+            model_version = model_service.metadata.get("model_version")
+            writer.enqueue(
+                api_request={
+                    "endpoint": "/api/v1/predict/batch",
+                    "request_data": {"employee_count": len(employees_data)},
+                    "client_ip": request.client.host if request.client else None,
+                    "user_agent": request.headers.get("user-agent"),
+                    "http_status": http_status_code,
+                    "response_time_ms": prediction_time_ms,
+                },
+                predictions=[
+                    {
+                        "employee_id": employee_id,
+                        "attrition_prob": prob_leave / 100,  # Stored as 0-1, API returns percentage
+                        "risk_level": risk_level,
+                        "model_version": model_version,
+                        "prediction_date": now,
+                        "features_snapshot": employee_data,
+                    }
+                    for employee_id, employee_data, (will_leave, prob_leave, prob_stay, risk_level) in zip(
+                        employee_ids, employees_data, predictions
                     )
-
-                # Commit handled by get_db() dependency
-                logger.debug(f"Logged batch predictions to database: request_id={api_request.id}, count={len(predictions)}")
-            except Exception as db_error:
-                logger.error(f"Failed to log batch to database: {db_error}")
-                # Don't fail the request if database logging fails
-                # Must rollback here since we're suppressing the exception
-                await db.rollback()
+                ],
+            )
 
         # Build response
         prediction_items = []
@@ -360,7 +333,7 @@ async def predict_batch(
                 "total_predictions": len(prediction_items),
                 "model_version": model_service.metadata.get("model_version"),
                 "prediction_time_ms": prediction_time_ms,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": now.isoformat().replace("+00:00", "Z"),
             },
         )
 
@@ -415,7 +388,7 @@ async def explain_prediction(employee: EmployeeFeatures):
             metadata={
                 "model_version": model_service.metadata.get("model_version"),
                 "explanation_time_ms": explanation_time_ms,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
             },
         )
 
@@ -49,6 +49,11 @@ class ModelService:
         Returns:
             True if loading successful, False otherwise
         """
+        for path in (self.model_path, self.metadata_path):
+            if not path.is_file():
+                logger.error(f"Failed to load model or metadata: {path} not found")
+                return False
+
         try:
             # Load model
             logger.info(f"Loading model from {self.model_path}")
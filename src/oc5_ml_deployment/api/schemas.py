@@ -8,7 +8,7 @@ data analysis and business requirements.
 
 from typing import Dict, List, Literal, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict
 
 
 class EmployeeFeatures(BaseModel):
@@ -46,31 +46,15 @@ class EmployeeFeatures(BaseModel):
     annes_sous_responsable_actuel: int = Field(..., ge=0, le=50, description="Years under current manager")
 
     # Categorical features
-    genre: str = Field(..., description="Gender")
-    statut_marital: str = Field(..., description="Marital status")
+    genre: Literal["Male", "Female", "M", "F", "Homme", "Femme"] = Field(..., description="Gender")
+    statut_marital: Literal["Single", "Married", "Divorced", "Célibataire", "Marié", "Divorcé"] = Field(
+        ..., description="Marital status"
+    )
     departement: str = Field(..., description="Department")
     poste: str = Field(..., description="Job position")
     domaine_etude: str = Field(..., description="Field of study")
     heure_supplementaires: Literal["Yes", "No"] = Field(..., description="Works overtime")
 
-    @field_validator('genre')
-    @classmethod
-    def validate_genre(cls, v: str) -> str:
-        """Validate gender field."""
-        allowed = {"Male", "Female", "M", "F", "Homme", "Femme"}
-        if v not in allowed:
-            raise ValueError(f"Genre must be one of {allowed}")
-        return v
-
-    @field_validator('statut_marital')
-    @classmethod
-    def validate_statut_marital(cls, v: str) -> str:
-        """Validate marital status field."""
-        allowed = {"Single", "Married", "Divorced", "Célibataire", "Marié", "Divorcé"}
-        if v not in allowed:
-            raise ValueError(f"Statut marital must be one of {allowed}")
-        return v
-
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -111,10 +95,19 @@ class PredictionResult(BaseModel):
     risk_level: Literal["LOW", "MEDIUM", "HIGH"] = Field(..., description="Risk categorization")
 
 
+class PredictionMetadata(BaseModel):
+    """Metadata attached to a single prediction."""
+    model_version: Optional[str] = Field(None, description="Version of the model that made the prediction")
+    prediction_time_ms: int = Field(..., ge=0, description="Model inference time in milliseconds")
+    timestamp: str = Field(..., description="Prediction time (ISO 8601, UTC)")
+
+    model_config = ConfigDict(protected_namespaces=())
+
+
 class PredictionResponse(BaseModel):
     """Response for single prediction endpoint."""
     prediction: PredictionResult
-    metadata: dict = Field(..., description="Prediction metadata")
+    metadata: PredictionMetadata = Field(..., description="Prediction metadata")
 
     model_config = {
         "json_schema_extra": {
@@ -137,7 +130,7 @@ class PredictionResponse(BaseModel):
 
 class EmployeeBatchItem(EmployeeFeatures):
     """Employee data with ID for batch predictions."""
-    employee_id: str = Field(..., description="Unique employee identifier")
+    employee_id: str = Field(..., max_length=50, description="Unique employee identifier")
 
 
 class BatchPredictionRequest(BaseModel):
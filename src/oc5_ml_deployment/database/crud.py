@@ -4,13 +4,14 @@ CRUD operations for database (Create, Read, Update, Delete).
 Minimal implementation with only operations needed for v1.0.0:
 - Create API request
 - Create prediction
+- Bulk insert API requests / predictions (multi-row INSERT)
 - Cleanup old data (365-day retention)
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete
-from datetime import datetime, timedelta
-from typing import Optional
+from sqlalchemy import delete, insert
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 import uuid
 import logging
 
@@ -68,7 +69,8 @@ async def create_prediction(
     attrition_prob: float,
     risk_level: str,
     model_version: str,
-    features_snapshot: Optional[dict] = None
+    features_snapshot: Optional[dict] = None,
+    prediction_date: Optional[datetime] = None
 ) -> Prediction:
     """
     Create a new prediction record.
@@ -81,6 +83,7 @@ async def create_prediction(
         risk_level: Risk category (LOW, MEDIUM, HIGH)
         model_version: Model version used (e.g., "xgb_enhanced_v1.0")
         features_snapshot: Preprocessed features (optional, for future analysis)
+        prediction_date: Prediction timestamp (default: now, UTC)
 
     Returns:
         Prediction: Created prediction object with generated ID
@@ -91,7 +94,7 @@ async def create_prediction(
         attrition_prob=attrition_prob,
         risk_level=risk_level,
         model_version=model_version,
-        prediction_date=datetime.utcnow(),
+        prediction_date=prediction_date or datetime.now(timezone.utc),
         features_snapshot=features_snapshot
     )
     session.add(prediction)
@@ -100,6 +103,54 @@ async def create_prediction(
     return prediction
 
 
+async def bulk_insert_api_requests(session: AsyncSession, rows: List[dict]) -> List[uuid.UUID]:
+    """
+    Insert many API request records with a single multi-row INSERT.
+
+    IDs are assigned in Python (when missing) so no RETURNING round-trip
+    is needed and predictions can reference them in the same batch.
+    The input dicts are not modified.
+
+    Args:
+        session: Database session
+        rows: Column values for each API request (see create_api_request)
+
+    Returns:
+        List[uuid.UUID]: IDs of the inserted requests, in input order
+    """
+    if not rows:
+        return []
+    # New dicts: the caller's rows are left untouched (safe to reuse)
+    rows = [{"id": uuid.uuid4(), **row} for row in rows]
+    await session.execute(insert(APIRequest).values(rows))
+    logger.debug(f"Bulk inserted {len(rows)} API requests")
+    return [row["id"] for row in rows]
+
+
+async def bulk_insert_predictions(session: AsyncSession, rows: List[dict]) -> List[uuid.UUID]:
+    """
+    Insert many prediction records with a single multi-row INSERT.
+
+    IDs are assigned in Python (when missing) so no RETURNING round-trip
+    is needed. The input dicts are not modified.
+
+    Args:
+        session: Database session
+        rows: Column values for each prediction, including request_id
+            (see create_prediction)
+
+    Returns:
+        List[uuid.UUID]: IDs of the inserted predictions, in input order
+    """
+    if not rows:
+        return []
+    # New dicts: the caller's rows are left untouched (safe to reuse)
+    rows = [{"id": uuid.uuid4(), **row} for row in rows]
+    await session.execute(insert(Prediction).values(rows))
+    logger.debug(f"Bulk inserted {len(rows)} predictions")
+    return [row["id"] for row in rows]
+
+
 # ============================================================================
 # DELETE Operations (Data Retention)
 # ============================================================================
@@ -120,7 +171,7 @@ async def cleanup_old_data(session: AsyncSession, retention_days: int = 365) ->
 
     Note: Should be run as a scheduled job (e.g., daily at 2 AM UTC)
     """
-    cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
 
     # Delete old requests (predictions will cascade)
     result = await session.execute(
@@ -7,11 +7,21 @@ Provides async database engine and session factory for PostgreSQL.
 import os
 import logging
 from typing import AsyncGenerator
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 logger = logging.getLogger(__name__)
 
+
+# JSONB (de)serialization for request_data / features_snapshot
+def _json_serializer(obj) -> str:
+    return orjson.dumps(obj).decode()
+
+
+_json_deserializer = orjson.loads
+
 # Get database URL from environment variable
 # For app connections (with connection pooling via pgbouncer)
 DATABASE_URL = os.getenv("OC5_DATABASE_URL")
@@ -19,6 +29,12 @@ DATABASE_URL = os.getenv("OC5_DATABASE_URL")
 # Check if database is configured
 DATABASE_ENABLED = DATABASE_URL is not None
 
+# Connection pool sizing (per worker process: total = workers x (size + overflow))
+POOL_SIZE = int(os.getenv("OC5_DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("OC5_DB_MAX_OVERFLOW", "5"))
+POOL_TIMEOUT = float(os.getenv("OC5_DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+POOL_RECYCLE = int(os.getenv("OC5_DB_POOL_RECYCLE", "3600"))  # Seconds before a connection is replaced
+
 if DATABASE_ENABLED:
     logger.info("Database is enabled")
 
@@ -26,10 +42,15 @@ if DATABASE_ENABLED:
     engine = create_async_engine(
         DATABASE_URL,
         echo=False,  # Set to True to see SQL queries (debugging)
-        pool_size=5,  # Number of permanent connections
-        max_overflow=10,  # Additional connections when pool is full
+        poolclass=AsyncAdaptedQueuePool,  # asyncio-aware queue pool (the default, made explicit)
+        pool_size=POOL_SIZE,  # Number of permanent connections
+        max_overflow=MAX_OVERFLOW,  # Additional connections when pool is full
+        pool_timeout=POOL_TIMEOUT,  # Fail fast instead of hanging when pool is exhausted
         pool_pre_ping=True,  # Verify connections before using
-        pool_recycle=3600,  # Recycle connections after 1 hour
+        pool_use_lifo=True,  # Reuse the most recent connection so idle extras can expire
+        pool_recycle=POOL_RECYCLE,  # Recycle connections before the server/pooler drops them
+        json_serializer=_json_serializer,  # orjson: faster JSONB encoding than stdlib json
+        json_deserializer=_json_deserializer,
         connect_args={
             "statement_cache_size": 0,  # Disable prepared statements for pgbouncer compatibility
         },
@@ -37,7 +37,7 @@ class APIRequest(Base):
     user_agent = Column(Text, nullable=True)
 
     # Response metadata
-    http_status = Column(Integer, nullable=False, index=True)
+    http_status = Column(Integer, nullable=False)  # Not indexed: low cardinality, write-heavy table
     response_time_ms = Column(Integer, nullable=True)
 
     # Relationships (1:N - one request can have multiple predictions for batch)
@@ -82,7 +82,7 @@ class Prediction(Base):
 
     # Prediction results
     attrition_prob = Column(Float, nullable=False)  # Probability of attrition (0-1)
-    risk_level = Column(String(10), nullable=False, index=True)  # LOW, MEDIUM, HIGH
+    risk_level = Column(String(10), nullable=False)  # LOW, MEDIUM, HIGH (not indexed: 3 values)
     model_version = Column(String(50), nullable=False, index=True)
 
     # Features snapshot (optional - for future analysis)
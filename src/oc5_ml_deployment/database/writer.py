@@ -0,0 +1,180 @@
+"""
+Background database writer for prediction logging.
+
+Takes database writes off the request path: endpoints enqueue rows
+(non-blocking) and a single consumer task drains the queue in batches,
+using one multi-row INSERT per table and one commit per batch.
+
+Lifecycle is driven by the FastAPI lifespan:
+    await writer.start()   # on startup
+    await writer.stop()    # on shutdown (flushes pending rows)
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import List, Optional, Tuple
+
+from . import crud, database
+
+logger = logging.getLogger(__name__)
+
+# Queue and batching settings
+QUEUE_MAXSIZE = 10_000  # Pending log entries before new ones are dropped
+BATCH_MAX_ROWS = 500  # Max rows (requests + predictions) written per commit
+FLUSH_INTERVAL_S = 0.05  # Max time to wait for a batch to fill up
+STOP_TIMEOUT_S = 10.0  # Max time stop() waits for queue room before giving up
+
+# One entry = one API request row + its prediction rows
+LogEntry = Tuple[dict, List[dict]]
+
+_queue: Optional[asyncio.Queue] = None
+_task: Optional[asyncio.Task] = None
+_STOP = object()  # Sentinel telling the consumer to flush and exit
+
+
+def enqueue(api_request: dict, predictions: List[dict]) -> bool:
+    """
+    Queue an API request and its predictions for logging (non-blocking).
+
+    Args:
+        api_request: APIRequest column values (endpoint, request_data, ...)
+        predictions: Prediction column values, without request_id
+            (it is linked to the API request when written)
+
+    Returns:
+        bool: True if queued, False if the writer is not running or the queue is full
+    """
+    if _queue is None:
+        return False
+
+    try:
+        _queue.put_nowait((api_request, predictions))
+    except asyncio.QueueFull:
+        logger.warning("Database write queue is full - dropping log entry")
+        return False
+    return True
+
+
+async def _insert_entries(entries: List[LogEntry]) -> None:
+    """Insert log entries in a single session and commit (raises on failure)."""
+    request_rows = []
+    prediction_rows = []
+    for api_request, predictions in entries:
+        # Pre-assign the request ID so predictions can reference it in the same batch
+        request_id = uuid.uuid4()
+        request_rows.append({**api_request, "id": request_id})
+        prediction_rows.extend({**p, "request_id": request_id} for p in predictions)
+
+    async with database.AsyncSessionLocal() as session:
+        await crud.bulk_insert_api_requests(session, request_rows)
+        await crud.bulk_insert_predictions(session, prediction_rows)
+        await session.commit()
+
+
+async def _write_batch(batch: List[LogEntry]) -> None:
+    """
+    Write a batch of log entries in a single session and commit.
+
+    If the batch fails, its entries are retried one by one so a single bad
+    row only loses its own request's log, not the other clients' rows.
+    """
+    try:
+        await _insert_entries(batch)
+        logger.debug(f"Wrote {len(batch)} API requests to database")
+        return
+    except Exception as db_error:
+        # Don't crash the consumer if database logging fails
+        if len(batch) == 1:
+            logger.error(f"Failed to write log entry to database: {db_error}")
+            return
+        logger.warning(f"Failed to write log batch to database, retrying entries one by one: {db_error}")
+
+    for entry in batch:
+        try:
+            await _insert_entries([entry])
+        except Exception as db_error:
+            logger.error(f"Failed to write log entry to database: {db_error}")
+
+
+async def _consume() -> None:
+    """Drain the queue, flushing every BATCH_MAX_ROWS rows or FLUSH_INTERVAL_S."""
+    loop = asyncio.get_running_loop()
+
+    while True:
+        entry = await _queue.get()
+        if entry is _STOP:
+            return
+
+        batch = [entry]
+        n_rows = 1 + len(entry[1])
+        stopping = False
+        deadline = loop.time() + FLUSH_INTERVAL_S
+
+        while n_rows < BATCH_MAX_ROWS:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if entry is _STOP:
+                stopping = True
+                break
+            batch.append(entry)
+            n_rows += 1 + len(entry[1])
+
+        await _write_batch(batch)
+        if stopping:
+            return
+
+
+def _log_dropped() -> None:
+    """Warn about entries left in the queue when the writer stops without flushing."""
+    if _queue.qsize():
+        logger.warning(f"Database writer stopped without flushing - dropping {_queue.qsize()} log entries")
+
+
+async def start() -> None:
+    """Create the queue and start the consumer task (no-op if database is disabled)."""
+    global _queue, _task
+
+    if not database.DATABASE_ENABLED or _task is not None:
+        return
+
+    _queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+    _task = asyncio.create_task(_consume())
+    logger.info("Database writer started")
+
+
+async def stop() -> None:
+    """Flush pending entries and stop the consumer task."""
+    global _queue, _task
+
+    if _task is None:
+        return
+
+    if _task.done():
+        # Consumer cancelled or crashed: nothing will drain the queue, so
+        # putting the sentinel could block forever on a full queue
+        if not _task.cancelled() and _task.exception() is not None:
+            logger.error(f"Database writer task failed: {_task.exception()}")
+        _log_dropped()
+    else:
+        try:
+            # Wait for room rather than dropping the sentinel, but not forever
+            await asyncio.wait_for(_queue.put(_STOP), STOP_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            _task.cancel()
+            try:
+                await _task
+            except asyncio.CancelledError:
+                pass
+            _log_dropped()
+        else:
+            await _task
+
+    _queue = None
+    _task = None
+    logger.info("Database writer stopped")
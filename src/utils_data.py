@@ -7,7 +7,6 @@ from __future__ import annotations
 from typing import Dict, Iterable, List, Tuple, Optional
 import numpy as np
 import pandas as pd
-from collections import Counter
 from typing import Tuple
 import pandas as pd
 
@@ -32,12 +31,27 @@ def load_raw_sources(path_sirh: str, path_eval: str, path_survey: str) -> dict[s
     """
     # Dummy safe version: just try reading, caller handles errors
     return {
-        "sirh": pd.read_csv(path_sirh),
-        "evals": pd.read_csv(path_eval),
-        "survey": pd.read_csv(path_survey),
+        "sirh": _read_csv(path_sirh),
+        "evals": _read_csv(path_eval),
+        "survey": _read_csv(path_survey),
     }
 
 
+def _read_csv(path: str) -> pd.DataFrame:
+    """
+    Read a CSV with the multi-threaded pyarrow parser, falling back to the C parser.
+
+    The pyarrow engine is stricter than the C parser (e.g. it rejects rows
+    with missing fields), so files it cannot parse are re-read with the C
+    parser. Columns stay NumPy-backed (no dtype_backend="pyarrow") so
+    downstream sklearn transformers and ``astype(int)`` calls behave as before.
+    """
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except ValueError:  # pyarrow.ArrowInvalid and pandas ParserError both subclass it
+        return pd.read_csv(path)
+
+
 def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Standardize column names to snake_case, strip spaces.
@@ -52,7 +66,7 @@ def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
         Same DataFrame with renamed columns.
     """
     df = df.copy()
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
+    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_", regex=False)
     return df
 
 
@@ -65,14 +79,25 @@ def build_central_df(sirh: pd.DataFrame, evals: pd.DataFrame, survey: pd.DataFra
     - Survey: has code_sondage matching id_employee
     """
     evals = evals.copy()
-    # Extract numeric part of eval_number to align with id_employee
-    evals["id_employee"] = evals["eval_number"].str.extract(r"(\d+)").astype(int)
+    # Extract numeric part of eval_number to align with id_employee.
+    # Fast path strips the 'E_' prefix (no per-cell regex); regex only if the format differs.
+    try:
+        evals["id_employee"] = evals["eval_number"].str.removeprefix("E_").astype("int32")
+    except ValueError:
+        evals["id_employee"] = evals["eval_number"].str.extract(r"(\d+)", expand=False).astype("int32")
     
     # Survey already has code_sondage -> rename to id_employee for clarity
     survey = survey.rename(columns={"code_sondage": "id_employee"})
+
+    # Same compact integer key everywhere (smaller hash tables, no dtype upcast in merges)
+    sirh = sirh.astype({"id_employee": "int32"})
+    survey = survey.astype({"id_employee": "int32"})
     
-    # Merge everything on id_employee
-    df = sirh.merge(evals, on="id_employee", how="left").merge(survey, on="id_employee", how="left")
+    # Merge everything on id_employee (one eval / one survey per employee)
+    df = (
+        sirh.merge(evals, on="id_employee", how="left", validate="many_to_one")
+        .merge(survey, on="id_employee", how="left", validate="many_to_one")
+    )
     return df
 
 def assess_missingness(
@@ -112,39 +137,36 @@ def assess_missingness(
     missing = df.isna().sum().to_frame("n_missing")
     missing["pct_missing"] = missing["n_missing"] / n_rows if n_rows else 0.0
 
+    # --- One value_counts() pass per column, reused by every stat below
+    vc_by_col = {col: df[col].value_counts(dropna=False) for col in df.columns}
+    first_cnt = pd.Series(
+        {col: int(vc.iloc[0]) if len(vc) else 0 for col, vc in vc_by_col.items()},
+        index=df.columns, dtype="int64",
+    )
+
     # --- True-constant columns (incl. all-NaN)
-    nunique = df.nunique(dropna=False)
+    nunique = pd.Series({col: len(vc) for col, vc in vc_by_col.items()}, index=df.columns, dtype="int64")
     constant_cols: List[str] = nunique[nunique <= 1].index.tolist()
 
     # --- Quasi-constant columns via dominance of top value
-    def _top_ratio(s: pd.Series) -> float:
-        if s.empty:
-            return 1.0
-        vc = s.value_counts(normalize=True, dropna=False)
-        return float(vc.iloc[0]) if len(vc) else 1.0
-
-    top_ratios = df.apply(_top_ratio)
+    top_ratios = first_cnt / n_rows if n_rows else pd.Series(1.0, index=df.columns)
     quasi_constant_cols = (
         top_ratios[top_ratios >= quasi_constant_threshold]
         .index.difference(constant_cols)
         .tolist()
     )
 
-    # --- Build compact profiling table using value_counts()
+    # --- Build compact profiling table from the cached value counts
     profile_rows = []
-    for col in df.columns:
-        vc = df[col].value_counts(dropna=False)
-        first_val = vc.index[0] if len(vc) else np.nan
-        first_cnt = int(vc.iloc[0]) if len(vc) else 0
-
+    for col, vc in vc_by_col.items():
         profile_rows.append({
             "column": col,
             "dtype": df[col].dtype,
             "nunique": int(nunique[col]),
             "n_missing": int(missing.loc[col, "n_missing"]),
             "pct_missing": float(missing.loc[col, "pct_missing"]),
-            "top_value": first_val,
-            "top_ratio": (first_cnt / n_rows) if n_rows else np.nan,
+            "top_value": vc.index[0] if len(vc) else np.nan,
+            "top_ratio": (first_cnt[col] / n_rows) if n_rows else np.nan,
         })
 
     profile = pd.DataFrame(profile_rows).sort_values(
@@ -203,23 +225,15 @@ def value_frequencies(
 
     series = df[column].dropna().astype(str)
 
-    # Aplatir si besoin
+    # Aplatir si besoin (chaîne pandas vectorisée, sans boucle Python)
     if split:
-        all_values = []
-        for entry in series:
-            parts = [v.strip() for v in entry.split(sep) if v.strip()]
-            all_values.extend(parts)
-    else:
-        all_values = series.tolist()
+        series = series.str.split(sep, regex=False).explode().str.strip()
+        series = series[series != ""]
 
-    counter = Counter(all_values)
-    total = sum(counter.values())
+    counts = series.value_counts()
+    total = counts.sum()
 
-    freq_df = (
-        pd.DataFrame(counter.items(), columns=[column, "Frequency"])
-        .sort_values("Frequency", ascending=False)
-        .reset_index(drop=True)
-    )
+    freq_df = counts.rename_axis(column).reset_index(name="Frequency")
     freq_df["Percentage"] = freq_df["Frequency"] / total * 100
 
     return freq_df.shape[0], freq_df
@@ -243,12 +257,19 @@ def attrition_rate_by_category(df: pd.DataFrame, cat_col: str, target: str = "a_
     pd.DataFrame
         Tableau avec colonnes [cat_col, 'n', 'taux_depart'].
     """
+    # Cible booléenne calculée une fois : agrégation 'mean' native, sans lambda par groupe
+    tmp = df[[cat_col, target]].copy()
+    tmp[cat_col] = tmp[cat_col].astype("category")
+    tmp["_left"] = tmp[target] == "Oui"
+
     grouped = (
-        df.groupby(cat_col)[target]
-        .agg(n="count", taux_depart=lambda x: (x == "Oui").mean())
+        tmp.groupby(cat_col, observed=True)
+        .agg(n=(target, "count"), taux_depart=("_left", "mean"))
         .reset_index()
         .sort_values("taux_depart", ascending=False)
     )
+    # Restaure le dtype d'origine (l'ordre des catégories ne doit pas imposer l'ordre des graphes)
+    grouped[cat_col] = grouped[cat_col].astype(df[cat_col].dtype)
     return grouped
 
 def suggest_correlated_features(
@@ -274,15 +295,31 @@ def suggest_correlated_features(
     if len(cols) <= 1:
         return [], (pd.DataFrame(columns=["col_i","col_j","abs_corr"]) if return_pairs else None)
 
-    corr = df[cols].corr(method=method).abs()
+    data = df[cols]
+    if method == "pearson" and not data.isna().to_numpy().any():
+        # Contiguous float64 block -> one BLAS-backed np.corrcoef call
+        arr = data.to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):  # constant columns -> NaN, like pandas
+            corr_vals = np.abs(np.corrcoef(arr, rowvar=False))
+        corr = pd.DataFrame(corr_vals, index=cols, columns=cols)
+    else:
+        # pandas handles pairwise NaNs and non-Pearson methods
+        corr = data.corr(method=method).abs()
     np.fill_diagonal(corr.values, 0.0)
 
-    iu = np.triu_indices_from(corr, k=1)
-    pairs = [(cols[i], cols[j], corr.iat[i, j]) for i, j in zip(*iu) if corr.iat[i, j] >= threshold]
-    if not pairs:
+    # Upper-triangle pairs above threshold, extracted in NumPy (no per-cell .iat)
+    mat = corr.to_numpy()
+    mask = np.triu(np.ones_like(mat, dtype=bool), k=1) & (mat >= threshold)
+    i_idx, j_idx = np.nonzero(mask)
+    if not len(i_idx):
         return [], (pd.DataFrame(columns=["col_i","col_j","abs_corr"]) if return_pairs else None)
 
-    pairs_df = pd.DataFrame(pairs, columns=["col_i","col_j","abs_corr"]).sort_values("abs_corr", ascending=False)
+    cols_arr = np.asarray(cols, dtype=object)
+    pairs_df = pd.DataFrame({
+        "col_i": cols_arr[i_idx],
+        "col_j": cols_arr[j_idx],
+        "abs_corr": mat[i_idx, j_idx],
+    }).sort_values("abs_corr", ascending=False)
 
     mean_abs = corr.mean(axis=0)
     to_drop: set = set()
@@ -1,4 +1,8 @@
 from __future__ import annotations
+import time
+import warnings
+from contextlib import nullcontext
+from functools import lru_cache
 from typing import List, Optional, Dict, Tuple
 import numpy as np
 import pandas as pd
@@ -12,17 +16,106 @@ from sklearn.model_selection import StratifiedKFold, cross_validate
 from sklearn.dummy import DummyClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import make_scorer, precision_score, recall_score, f1_score, roc_auc_score, average_precision_score
+from sklearn.metrics import make_scorer, accuracy_score, precision_score, recall_score, f1_score, roc_auc_score, average_precision_score, precision_recall_curve
 
 
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import StratifiedKFold, cross_val_predict
 
 
-from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.base import BaseEstimator, ClassifierMixin, OneToOneFeatureMixin, TransformerMixin, clone
 from sklearn.utils.validation import check_is_fitted
 
+try:  # scikit-learn >= 1.6
+    from sklearn.utils.validation import validate_data
+    _ALLOW_NAN = {"ensure_all_finite": "allow-nan"}
+except ImportError:  # scikit-learn < 1.6: estimator method, older keyword
+    def validate_data(estimator, X, **check_params):
+        return estimator._validate_data(X, **check_params)
+    _ALLOW_NAN = {"force_all_finite": "allow-nan"}
+
 from imblearn.pipeline import Pipeline as ImbPipeline
+from joblib import Memory, hash as joblib_hash, parallel_backend
+from scipy.special import expit
+
+
+# Comma-separated list tokens, stripped of surrounding whitespace ("a, b c" -> ["a", "b c"]).
+# Tokenizing with a regex (instead of a Python tokenizer) keeps the work in C and the pipeline picklable.
+_COMMA_TOKEN_PATTERN = r"[^,\s][^,]*[^,\s]|[^,\s]"
+
+
+def _ravel(x):
+    """Flatten (n_samples, 1) -> (n_samples,) (module-level so pipelines can be pickled)."""
+    return x.ravel()
+
+
+class FastMedianImputer(OneToOneFeatureMixin, TransformerMixin, BaseEstimator):
+    """
+    Median imputer for numeric columns, lighter than SimpleImputer(strategy="median"):
+      - fit: column medians with np.nanmedian (same values as SimpleImputer)
+      - transform: one float64 copy, NaNs filled in place (no missing-value mask round trips)
+    All-NaN columns are kept and filled with 0 (SimpleImputer would drop them).
+    Like SimpleImputer, transform rejects inputs whose column count or names differ from fit.
+    """
+
+    def fit(self, X, y=None):
+        # Sets n_features_in_ (and feature_names_in_ for DataFrames)
+        X = validate_data(self, X, dtype=np.float64, reset=True, **_ALLOW_NAN)
+        all_nan = np.isnan(X).all(axis=0)
+        self.statistics_ = np.zeros(X.shape[1])
+        self.statistics_[~all_nan] = np.nanmedian(X[:, ~all_nan], axis=0)
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, "statistics_")
+        # Checks column count / names against fit; copy=True: single copy, filled in place
+        out = validate_data(self, X, dtype=np.float64, copy=True, reset=False, **_ALLOW_NAN)
+        np.copyto(out, self.statistics_, where=np.isnan(out))
+        return out
+
+
+class _MLBTransformer(TransformerMixin, BaseEstimator):
+    """
+    MultiLabelBinarizer-like transformer for a column of pre-split lists (["a", "b"], ...).
+      - fit: keeps the max_features most frequent labels (ties broken alphabetically)
+      - transform: binary CSR indicator matrix, built with one explode + index lookup
+        (no per-row Python callback). Unknown labels and missing cells are ignored.
+    """
+
+    def __init__(self, max_features: Optional[int] = None):
+        self.max_features = max_features
+
+    @staticmethod
+    def _exploded(X) -> pd.Series:
+        # list cells -> one row per label (index = sample position); NaN / empty cells drop out
+        return pd.Series(_ravel(np.asarray(X, dtype=object))).explode().dropna()
+
+    def fit(self, X, y=None):
+        counts = self._exploded(X).value_counts()
+        counts = counts.sort_index().sort_values(ascending=False, kind="stable")
+        if self.max_features is not None:
+            counts = counts.iloc[:self.max_features]
+        self.classes_ = np.array(sorted(counts.index), dtype=object)
+        return self
+
+    def transform(self, X):
+        from scipy import sparse
+
+        check_is_fitted(self, "classes_")
+        n_samples = len(X)
+        labels = self._exploded(X)
+        cols = pd.Index(self.classes_).get_indexer(labels.to_numpy())
+        keep = cols >= 0
+        rows = labels.index.to_numpy()[keep]
+        out = sparse.csr_matrix(
+            (np.ones(keep.sum()), (rows, cols[keep])), shape=(n_samples, len(self.classes_))
+        )
+        out.data[:] = 1.0  # binary, even if a label is repeated in a row
+        return out
+
+    def get_feature_names_out(self, input_features=None):
+        check_is_fitted(self, "classes_")
+        return self.classes_.copy()
 
 
 def make_preprocessor(
@@ -31,19 +124,31 @@ def make_preprocessor(
     *,
     multi_list_col: Optional[str] = None,
     max_categories: int = 30,
+    min_frequency: Optional[float] = 0.01,
     multi_max_features: int = 30,
     onehot_drop_binary: bool = True,
     onehot_sparse: bool = True,
+    prep_n_jobs: Optional[int] = -1,
+    fast_median: bool = True,
+    already_split: bool = False,
 ):
     """
     Build a ColumnTransformer that:
       - One-hots single-valued categorical columns (drops one level if binary).
-      - Vectorizes an optional multi-valued list column (comma-separated) with CountVectorizer (binary).
-      - Imputes numerics with median.
+      - Vectorizes an optional multi-valued list column (comma-separated) with CountVectorizer (binary),
+        or, if already_split=True (cells are lists of labels), binarizes it directly (_MLBTransformer).
+      - Imputes numerics with median (FastMedianImputer, or SimpleImputer if fast_median=False).
+    The three branches work on disjoint columns and run in parallel (prep_n_jobs).
     Notes:
       - Pass your own column lists. Columns absent in the DataFrame will be ignored by ColumnTransformer at fit time.
       - If you have binary categorical columns (e.g., Oui/Non, M/F), include them in single_cat_cols:
         OneHotEncoder(drop='if_binary') will keep only 1 column per binary feature.
+      - Categories seen in less than min_frequency of the rows (default 1%) are absorbed into
+        the "infrequent" bucket at fit time, on top of the max_categories cap (None disables it).
+      - Use prep_n_jobs=1 when the preprocessor runs inside an already parallel loop
+        (e.g. cross_validate(n_jobs=-1)) or for a model served one row at a time.
+      - Use fast_median=False for pipelines saved for the API: the pickle then only
+        references sklearn classes (no dependency on this module at load time).
 
     Returns
     -------
@@ -53,6 +158,7 @@ def make_preprocessor(
     # 1) Single-valued categoricals → OneHot
     ohe = OneHotEncoder(
         handle_unknown="infrequent_if_exist",
+        min_frequency=min_frequency,
         max_categories=max_categories,
         drop="if_binary" if onehot_drop_binary else None,
         sparse_output=onehot_sparse,
@@ -64,14 +170,18 @@ def make_preprocessor(
 
     # 2) Optional multi-valued (comma-separated) → CountVectorizer(binary)
     multiuse_pipe = None
-    if multi_list_col:
+    if multi_list_col and already_split:
+        # Pre-split lists → indicator matrix without tokenizing
+        multiuse_pipe = Pipeline([
+            ("binarize", _MLBTransformer(max_features=multi_max_features)),
+        ])
+    elif multi_list_col:
         multiuse_pipe = Pipeline([
             ("impute", SimpleImputer(strategy="constant", fill_value="")),
             # flatten (n_samples, 1) -> (n_samples,)
-            ("flatten", FunctionTransformer(lambda x: x.ravel(), feature_names_out="one-to-one")),
+            ("flatten", FunctionTransformer(_ravel, feature_names_out="one-to-one")),
             ("vectorize", CountVectorizer(
-                tokenizer=lambda s: [t.strip() for t in s.split(",") if t.strip()],
-                token_pattern=None,
+                token_pattern=_COMMA_TOKEN_PATTERN,
                 lowercase=False,
                 binary=True,
                 max_features=multi_max_features,
@@ -80,7 +190,7 @@ def make_preprocessor(
 
     # 3) Numerics → median impute
     num_pipe = Pipeline([
-        ("impute", SimpleImputer(strategy="median")),
+        ("impute", FastMedianImputer() if fast_median else SimpleImputer(strategy="median")),
     ])
 
     transformers = []
@@ -95,6 +205,7 @@ def make_preprocessor(
         transformers=transformers,
         remainder="drop",
         verbose_feature_names_out=True,
+        n_jobs=prep_n_jobs,
     )
     return preprocessor
 
@@ -104,103 +215,83 @@ def make_preprocessors_for_smote(
     *,
     multi_list_col: Optional[str] = None,
     max_categories: int = 30,
+    min_frequency: Optional[float] = 0.01,
     multi_max_features: int = 30,
     onehot_drop_binary: bool = True,
     onehot_sparse: bool = True,
+    prep_n_jobs: Optional[int] = -1,
+    fast_median: bool = True,
+    already_split: bool = False,
+    X_sample: Optional[pd.DataFrame] = None,
 ):
     """
-    Create two preprocessors:
-      - prep_sample: uses dense output for SMOTE compatibility
-      - prep_model: normal sparse/dense encoder for model training
-    Returns (prep_sample, prep_model, cat_mask)
+    Create the preprocessor to use in front of SMOTE-family samplers.
+      - prep_model: normal sparse/dense encoder, used for both resampling and model training
+        (no dense copy: SMOTENC works on the sparse one-hot output directly)
+      - cat_mask: boolean mask over the *output* features (one-hot and multi-valued columns are
+        categorical), derived from get_feature_names_out() after fitting prep_model on X_sample.
+        Pass the training data (or a sample with the same categories) so the layout matches.
+        Without X_sample the layout is unknown and cat_mask is None: SMOTENC (see LazySMOTENC /
+        make_samplers) then flags the 0/1 indicator columns of each transformed fold.
+    Its branches run in parallel (prep_n_jobs, see make_preprocessor).
+    Returns (prep_model, cat_mask); prep_model is fitted on X_sample if given.
     """
-
-    from sklearn.preprocessing import OneHotEncoder, FunctionTransformer
-    from sklearn.impute import SimpleImputer
-    from sklearn.compose import ColumnTransformer
-    from sklearn.pipeline import Pipeline
-    from sklearn.feature_extraction.text import CountVectorizer
-
-    # --- Base categorical pipeline
-    ohe_dense = OneHotEncoder(
-        handle_unknown="infrequent_if_exist",
-        max_categories=max_categories,
-        drop="if_binary" if onehot_drop_binary else None,
-        sparse_output=False,  # dense for SMOTE
-    )
-    ohe_user = OneHotEncoder(
-        handle_unknown="infrequent_if_exist",
+    prep_model = make_preprocessor(
+        single_cat_cols,
+        num_cols,
+        multi_list_col=multi_list_col,
         max_categories=max_categories,
-        drop="if_binary" if onehot_drop_binary else None,
-        sparse_output=onehot_sparse,
+        min_frequency=min_frequency,
+        multi_max_features=multi_max_features,
+        onehot_drop_binary=onehot_drop_binary,
+        onehot_sparse=onehot_sparse,
+        prep_n_jobs=prep_n_jobs,
+        fast_median=fast_median,
+        already_split=already_split,
     )
-
-    cat_pipe_dense = Pipeline([
-        ("impute", SimpleImputer(strategy="most_frequent")),
-        ("onehot", ohe_dense),
-    ])
-    cat_pipe_user = Pipeline([
-        ("impute", SimpleImputer(strategy="most_frequent")),
-        ("onehot", ohe_user),
-    ])
-
-    # --- Multi-valued list column (optional)
-    multi_pipe = None
-    if multi_list_col:
-        multi_pipe = Pipeline([
-            ("impute", SimpleImputer(strategy="constant", fill_value="")),
-            ("flatten", FunctionTransformer(lambda x: x.ravel(), feature_names_out="one-to-one")),
-            ("vectorize", CountVectorizer(
-                tokenizer=lambda s: [t.strip() for t in s.split(",") if t.strip()],
-                token_pattern=None,
-                lowercase=False,
-                binary=True,
-                max_features=multi_max_features,
-            )),
-        ])
-
-    # --- Numeric pipeline
-    num_pipe = Pipeline([("impute", SimpleImputer(strategy="median"))])
-
-    # --- Combine all
-    def build_transformer(cat_pipe):
-        transformers = []
-        if single_cat_cols:
-            transformers.append(("cats", cat_pipe, single_cat_cols))
-        if multi_pipe:
-            transformers.append(("multiuse", multi_pipe, [multi_list_col]))
-        if num_cols:
-            transformers.append(("num", num_pipe, num_cols))
-        return ColumnTransformer(transformers=transformers, remainder="drop")
-
-    prep_sample = build_transformer(cat_pipe_dense)
-    prep_model = build_transformer(cat_pipe_user)
-
-    # --- cat_mask: True for each categorical feature
-    cat_mask = [False] * len(num_cols) + [True] * len(single_cat_cols)
-    return prep_sample, prep_model, cat_mask
+    cat_mask = None
+    if X_sample is not None:
+        names = prep_model.fit(X_sample).get_feature_names_out()
+        cat_mask = np.array([name.startswith(("cats__", "multiuse__")) for name in names])
+    return prep_model, cat_mask
 
 # This section provides functions for classification and running models
 
-
-
-def _default_classifiers() -> Dict[str, object]:
-    """Return a minimal set of baseline classifiers with standard params."""
-    from sklearn.dummy import DummyClassifier
-    from sklearn.linear_model import LogisticRegression
-    from sklearn.ensemble import RandomForestClassifier
-    models = {
-        "Dummy(stratified)": DummyClassifier(strategy="stratified", random_state=42),
-        # no n_jobs param for LogReg in many versions; liblinear is stable for binary
-        "LogReg": LogisticRegression(max_iter=1000, class_weight="balanced", solver="liblinear"),
-        "RandomForest": RandomForestClassifier(
+def _single_threaded(estimator, n_jobs: Optional[int]):
+    """
+    Return a clone of `estimator` (preprocessor, RF, XGB, ...) with n_jobs=1 when the
+    outer CV loop is already parallel: nested n_jobs=-1 oversubscribes the CPU.
+    """
+    if n_jobs != 1 and "n_jobs" in estimator.get_params(deep=False):
+        return clone(estimator).set_params(n_jobs=1)
+    return estimator
+
+
+
+# Optional: XGBoost if present (probed once, at import)
+try:
+    from xgboost import XGBClassifier
+    _HAS_XGB = True
+except Exception:
+    _HAS_XGB = False
+
+
+@lru_cache(maxsize=1)
+def _classifier_specs() -> Tuple[Tuple[str, type, Dict[str, object]], ...]:
+    """(name, estimator class, params) of the default classifiers, built once."""
+    specs = [
+        ("Dummy(stratified)", DummyClassifier, dict(strategy="stratified", random_state=42)),
+        # saga works on the sparse one-hot output directly; tol=1e-3 stops once the fit is good enough.
+        # n_jobs=1: parallelism comes from the CV folds. (Only the CV default; saved models are unaffected.)
+        ("LogReg", LogisticRegression, dict(
+            max_iter=1000, class_weight="balanced", solver="saga", tol=1e-3, n_jobs=1, random_state=42
+        )),
+        ("RandomForest", RandomForestClassifier, dict(
             n_estimators=300, random_state=42, class_weight="balanced_subsample", n_jobs=-1
-        ),
-    }
-    # Optional: XGBoost if present
-    try:
-        from xgboost import XGBClassifier
-        models["XGBoost"] = XGBClassifier(
+        )),
+    ]
+    if _HAS_XGB:
+        specs.append(("XGBoost", XGBClassifier, dict(
             random_state=42,
             n_estimators=300,
             learning_rate=0.1,
@@ -210,8 +301,8 @@ def _default_classifiers() -> Dict[str, object]:
             n_jobs=-1,
             eval_metric="logloss",
             tree_method="hist",
-        )
-        models["XGBoost_enhanced"] = XGBClassifier(
+        )))
+        specs.append(("XGBoost_enhanced", XGBClassifier, dict(
             random_state=42,
             n_estimators=200,
             learning_rate=0.1,
@@ -225,10 +316,49 @@ def _default_classifiers() -> Dict[str, object]:
             n_jobs=-1,
             eval_metric="logloss",
             tree_method="hist",
-        )
-    except Exception:
-        pass
-    return models
+        )))
+    return tuple(specs)
+
+
+def _default_classifiers() -> Dict[str, object]:
+    """Return a minimal set of baseline classifiers with standard params (fresh instances)."""
+    return {name: cls(**params) for name, cls, params in _classifier_specs()}
+
+
+# Per-fold metrics collected by the CV helpers, and their summary column names
+_CV_METRICS = ["accuracy", "precision", "recall", "f1", "roc_auc", "avg_precision", "fit_time", "score_time"]
+_CV_COLUMNS = [f"{m}_mean" for m in _CV_METRICS[:-2]] + ["fit_time_s", "score_time_s"]
+
+
+@lru_cache(maxsize=8)
+def _cached_splits(y_codes: bytes, cv_splits: int, random_state: int) -> Tuple[Tuple[np.ndarray, np.ndarray], ...]:
+    """StratifiedKFold(shuffle=True) splits for integer-coded labels, computed once per (y, cv, seed)."""
+    y = np.frombuffer(y_codes, dtype=np.int64)
+    skf = StratifiedKFold(n_splits=cv_splits, shuffle=True, random_state=random_state)
+    splits = tuple(skf.split(np.zeros((len(y), 1)), y))
+    for tr, te in splits:
+        tr.flags.writeable = te.flags.writeable = False  # shared between callers
+    return splits
+
+
+def _cv_splits(y, cv_splits: int, random_state: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stratified CV splits shared by all the CV helpers: identical (X, y, cv, seed) in the same
+    session reuse the same folds instead of re-stratifying.
+    """
+    # Stratification only depends on class membership: key on integer class codes
+    _, codes = np.unique(np.asarray(y), return_inverse=True)
+    return list(_cached_splits(codes.astype(np.int64).tobytes(), cv_splits, random_state))
+
+
+def _outer_cv_backend(n_jobs: Optional[int]):
+    """
+    joblib context for CV folds run in parallel: loky workers limited to one BLAS/OpenMP
+    thread each, so (workers x inner threads) does not oversubscribe the CPU.
+    """
+    if n_jobs == 1:
+        return nullcontext()
+    return parallel_backend("loky", inner_max_num_threads=1)
 
 
 def quick_cv_models(
@@ -245,8 +375,11 @@ def quick_cv_models(
 
     Scorers: accuracy, precision, recall, f1, roc_auc, average_precision (PR AUC).
     Returns a DataFrame sorted by average_precision (higher is better).
+    When n_jobs != 1 the folds run in parallel, so the preprocessor and the classifiers
+    (RandomForest / XGBoost use n_jobs=-1) are run with n_jobs=1 to avoid oversubscription.
     """
-    skf = StratifiedKFold(n_splits=cv_splits, shuffle=True, random_state=random_state)
+    splits = _cv_splits(y, cv_splits, random_state)  # identical folds for every model
+    preprocessor = _single_threaded(preprocessor, n_jobs)  # folds already run in parallel
 
     scorers = {
         "accuracy": "accuracy",
@@ -257,34 +390,29 @@ def quick_cv_models(
         "avg_precision": "average_precision",  # PR AUC
     }
 
-    rows = []
-    for name, clf in _default_classifiers().items():
-        pipe = Pipeline([("prep", preprocessor), ("clf", clf)])
-        scores = cross_validate(
-            pipe,
-            X,
-            y,
-            scoring=scorers,
-            cv=skf,
-            n_jobs=n_jobs,
-            return_train_score=False,
-            error_score="raise",
-        )
-        rows.append(
-            {
-                "model": name,
-                "accuracy_mean": scores["test_accuracy"].mean(),
-                "precision_mean": scores["test_precision"].mean(),
-                "recall_mean": scores["test_recall"].mean(),
-                "f1_mean": scores["test_f1"].mean(),
-                "roc_auc_mean": scores["test_roc_auc"].mean(),
-                "avg_precision_mean": scores["test_avg_precision"].mean(),
-                "fit_time_s": np.mean(scores["fit_time"]),
-                "score_time_s": np.mean(scores["score_time"]),
-            }
-        )
-
-    df = pd.DataFrame(rows).sort_values("avg_precision_mean", ascending=False).reset_index(drop=True)
+    classifiers = _default_classifiers()
+    values = np.empty((len(classifiers), len(_CV_METRICS)))
+    for i, (name, clf) in enumerate(classifiers.items()):
+        pipe = Pipeline([("prep", preprocessor), ("clf", _single_threaded(clf, n_jobs))])
+        with _outer_cv_backend(n_jobs):
+            scores = cross_validate(
+                pipe,
+                X,
+                y,
+                scoring=scorers,
+                cv=splits,
+                n_jobs=n_jobs,
+                return_train_score=False,
+                error_score="raise",
+            )
+        values[i] = [scores[f"test_{k}"].mean() for k in scorers] + [
+            scores["fit_time"].mean(),
+            scores["score_time"].mean(),
+        ]
+
+    df = pd.DataFrame(values, columns=_CV_COLUMNS)
+    df.insert(0, "model", list(classifiers))
+    df = df.sort_values("avg_precision_mean", ascending=False).reset_index(drop=True)
     return df
 
 
@@ -292,6 +420,18 @@ def quick_cv_models(
 # reuse your _default_classifiers()
 # def _default_classifiers() -> Dict[str, object]: ... (already defined above)
 
+# On-disk cache of out-of-fold predictions, shared by oof_probas and cross_val_threshold_metrics
+# across notebook cells/sessions. Delete the directory to invalidate it.
+_memory = Memory(location=".cache_oof", verbose=0)
+
+
+@_memory.cache(ignore=["X", "y", "n_jobs"])
+def _cached_cross_val_predict(pipe, X_hash: str, y_hash: str, cv, method: str, *, X, y, n_jobs):
+    """cross_val_predict keyed on (unfitted pipeline, data hashes, cv splitter, method)."""
+    with _outer_cv_backend(n_jobs):
+        return cross_val_predict(pipe, X, y, cv=cv, method=method, n_jobs=n_jobs)
+
+
 def oof_probas(
     preprocessor,
     X: pd.DataFrame,
@@ -304,15 +444,18 @@ def oof_probas(
     """
     Return out-of-fold positive-class probabilities for each default classifier.
     Uses cross_val_predict(..., method='predict_proba') inside StratifiedKFold.
+    Results are cached on disk in .cache_oof (same data, pipeline and CV => no refit).
     """
-    skf = StratifiedKFold(n_splits=cv_splits, shuffle=True, random_state=random_state)
+    splits = _cv_splits(y, cv_splits, random_state)
+    preprocessor = _single_threaded(preprocessor, n_jobs)  # folds already run in parallel
+    X_hash, y_hash = joblib_hash(X), joblib_hash(y)  # hashed once, not per model
     out = {}
     for name, clf in _default_classifiers().items():
-        pipe = Pipeline([("prep", preprocessor), ("clf", clf)])
+        pipe = Pipeline([("prep", preprocessor), ("clf", _single_threaded(clf, n_jobs))])
         # prefer predict_proba; if not available, fall back to decision_function
         method = "predict_proba" if hasattr(clf, "predict_proba") else "decision_function"
-        preds = cross_val_predict(
-            pipe, X, y, cv=skf, method=method, n_jobs=n_jobs
+        preds = _cached_cross_val_predict(
+            pipe, X_hash, y_hash, splits, method, X=X, y=y, n_jobs=n_jobs
         )
         # convert to positive-class probability if predict_proba
         if method == "predict_proba":
@@ -337,6 +480,10 @@ def make_prec_at_recall_floor(floor: float = 0.80):
     return make_scorer(_score, greater_is_better=True)
 
     
+# Below this many rows on a side, GateRankClassifier scores both sides sequentially
+_GATE_PARALLEL_MIN_ROWS = 1000
+
+
 class GateRankClassifier(BaseEstimator, ClassifierMixin):
     """
     Two-stage classifier:
@@ -398,52 +545,64 @@ class GateRankClassifier(BaseEstimator, ClassifierMixin):
 
     def _scores(self, X):
         check_is_fitted(self, ["gate_", "pos_", "neg_"])
+        from joblib import Parallel, delayed
+
         p_gate = self.gate_.predict_proba(X)[:, 1]
         n = p_gate.shape[0]
-        pos_mask = p_gate >= self.gate_threshold
-        neg_mask = ~pos_mask
+        pos_mask = p_gate >= self.gate_threshold  # computed once, returned for predict
 
         p_pos = np.zeros(n, dtype=float)
         p_neg = np.zeros(n, dtype=float)
+        sides = [
+            (est, idx, out)
+            for est, idx, out in ((self.pos_, np.flatnonzero(pos_mask), p_pos),
+                                  (self.neg_, np.flatnonzero(~pos_mask), p_neg))
+            if len(idx)
+        ]
+
+        def _side_proba(est, idx):
+            X_side = X.iloc[idx] if hasattr(X, "iloc") else X[idx]
+            return est.predict_proba(X_side)[:, 1]
+
+        # Each ranker only scores its own side. Both sides run in two threads (tree traversal
+        # releases the GIL), unless one side is too small to be worth the dispatch overhead.
+        parallel = len(sides) == 2 and min(len(idx) for _, idx, _ in sides) >= _GATE_PARALLEL_MIN_ROWS
+        probas = Parallel(n_jobs=2 if parallel else 1, prefer="threads")(
+            delayed(_side_proba)(est, idx) for est, idx, _ in sides
+        )
+        for (_, idx, out), proba in zip(sides, probas):
+            out[idx] = proba
 
-        if np.any(pos_mask):
-            idx_pos = np.flatnonzero(pos_mask)
-            X_pos = X.iloc[idx_pos] if hasattr(X, "iloc") else X[idx_pos]
-            p_pos[idx_pos] = self.pos_.predict_proba(X_pos)[:, 1]
-
-        if np.any(neg_mask):
-            idx_neg = np.flatnonzero(neg_mask)
-            X_neg = X.iloc[idx_neg] if hasattr(X, "iloc") else X[idx_neg]
-            p_neg[idx_neg] = self.neg_.predict_proba(X_neg)[:, 1]
-
-        return p_gate, p_pos, p_neg
+        return p_gate, p_pos, p_neg, pos_mask
 
     def predict(self, X):
-        p_gate, p_pos, p_neg = self._scores(X)
+        p_gate, p_pos, p_neg, pos_mask = self._scores(X)
         n = len(p_gate)
         yhat = np.zeros(n, dtype=int)
 
-        pos_idx = np.flatnonzero(p_gate >= self.gate_threshold)
-        neg_idx = np.flatnonzero(p_gate <  self.gate_threshold)
+        pos_idx = np.flatnonzero(pos_mask)
+        neg_idx = np.flatnonzero(~pos_mask)
 
         if len(pos_idx):
             k_pos = int(np.floor(self.top_pos * len(pos_idx)))
             if k_pos > 0:
-                order_pos = pos_idx[np.argsort(-p_pos[pos_idx])]
-                yhat[order_pos[:k_pos]] = 1
+                # top-k as a set: argpartition is O(n), no full sort needed
+                top = np.argpartition(p_pos[pos_idx], -k_pos)[-k_pos:]
+                yhat[pos_idx[top]] = 1
 
         if len(neg_idx):
             k_neg = int(np.floor(self.top_neg * len(neg_idx)))
             if k_neg > 0:
-                order_neg = neg_idx[np.argsort(-p_neg[neg_idx])]
-                yhat[order_neg[:k_neg]] = 1
+                # top-k as a set: argpartition is O(n), no full sort needed
+                top = np.argpartition(p_neg[neg_idx], -k_neg)[-k_neg:]
+                yhat[neg_idx[top]] = 1
 
         return yhat
 """
     def predict_proba(self, X):
         # fused (discontinuous) score: ranker score from the side you belong to
-        p_gate, p_pos, p_neg = self._scores(X)
-        s = np.where(p_gate >= self.gate_threshold, p_pos, p_neg)
+        p_gate, p_pos, p_neg, pos_mask = self._scores(X)
+        s = np.where(pos_mask, p_pos, p_neg)
         s = np.clip(s, 0.0, 1.0)
         proba = np.vstack([1.0 - s, s]).T
         return proba
@@ -463,15 +622,78 @@ def _require_imblearn():
         ) from e
 
 
-def make_samplers(basic: bool = True):
+def _indicator_columns(X) -> np.ndarray:
+    """Boolean mask of the columns of X (dense or sparse) that only hold 0/1 values."""
+    from scipy import sparse
+
+    if sparse.issparse(X):
+        X = X.tocsr()
+        mask = np.ones(X.shape[1], dtype=bool)
+        mask[X.indices[(X.data != 0) & (X.data != 1)]] = False
+        return mask
+    X = np.asarray(X)
+    return ((X == 0) | (X == 1)).all(axis=0)
+
+
+class LazySMOTENC(BaseEstimator):
+    """
+    SMOTENC whose categorical mask is resolved on the (preprocessed) data it resamples.
+      - categorical_features=None: one-hot / indicator (0/1) columns are treated as categorical,
+        so synthetic samples get valid indicators instead of fractional ones.
+      - categorical_features=mask or indices: used as-is (output-feature space).
+    Falls back to plain SMOTE when no column (or every column) is categorical,
+    which SMOTENC does not support. Sparse input is kept sparse.
+    """
+
+    def __init__(self, categorical_features=None, k_neighbors: int = 3, random_state: int = 42):
+        self.categorical_features = categorical_features
+        self.k_neighbors = k_neighbors
+        self.random_state = random_state
+
+    def fit_resample(self, X, y):
+        from imblearn.over_sampling import SMOTE, SMOTENC
+
+        cat = None if self.categorical_features is None else np.asarray(self.categorical_features)
+        if cat is not None and cat.dtype == bool and cat.shape[0] != X.shape[1]:
+            # e.g. a fold where a rare category is absent: the encoded layout differs from the mask
+            warnings.warn(
+                f"categorical_features mask has {cat.shape[0]} entries for {X.shape[1]} features; "
+                "detecting indicator columns instead",
+                UserWarning,
+            )
+            cat = None
+
+        if cat is None:
+            mask = _indicator_columns(X)
+        else:
+            mask = np.zeros(X.shape[1], dtype=bool)
+            mask[cat] = True
+
+        if mask.any() and not mask.all():
+            self.sampler_ = SMOTENC(categorical_features=np.flatnonzero(mask).tolist(), k_neighbors=self.k_neighbors,
+                                    random_state=self.random_state)
+        else:
+            self.sampler_ = SMOTE(k_neighbors=self.k_neighbors, random_state=self.random_state)
+
+        try:
+            return self.sampler_.fit_resample(X, y)
+        except (TypeError, ValueError):
+            # Densify only if the sparse path is rejected (e.g. older imblearn versions)
+            if not hasattr(X, "toarray"):
+                raise
+            return self.sampler_.fit_resample(X.toarray(), y)
+
+
+def make_samplers(basic: bool = True, cat_mask=None):
     """
     Build a small, robust palette of samplers.
-    Returns a dict: {name: sampler_instance}
+    SMOTE variants use SMOTENC with `cat_mask` (output-feature space); None lets it
+    detect the one-hot columns of each fold (see LazySMOTENC).
+    Returns a dict: {name: sampler_instance or list of (name, sampler) steps}
     """
     _require_imblearn()
-    from imblearn.under_sampling import RandomUnderSampler, NearMiss
-    from imblearn.over_sampling import RandomOverSampler, SMOTE
-    from imblearn.combine import SMOTETomek
+    from imblearn.under_sampling import RandomUnderSampler, NearMiss, TomekLinks
+    from imblearn.over_sampling import RandomOverSampler
 
     samplers = {}
 
@@ -486,11 +708,15 @@ def make_samplers(basic: bool = True):
     # ---- OVERSAMPLING
     samplers["Over:Random"] = RandomOverSampler(random_state=42)
     # SMOTE can fail if k_neighbors >= minority count; keep conservative
-    samplers["Over:SMOTE"] = SMOTE(random_state=42, k_neighbors=3)
+    samplers["Over:SMOTE"] = LazySMOTENC(categorical_features=cat_mask, k_neighbors=3, random_state=42)
 
     # ---- HYBRID
-    # Hybrid (SMOTE + Tomek links) is a good out-of-the-box combo
-    samplers["Hybrid:SMOTE+Tomek"] = SMOTETomek(random_state=42, smote=SMOTE(random_state=42, k_neighbors=3))
+    # Hybrid (SMOTE + Tomek links) is a good out-of-the-box combo.
+    # Same as SMOTETomek, written as steps because SMOTETomek only accepts a plain SMOTE.
+    samplers["Hybrid:SMOTE+Tomek"] = [
+        ("smote", LazySMOTENC(categorical_features=cat_mask, k_neighbors=3, random_state=42)),
+        ("tomek", TomekLinks(sampling_strategy="all")),
+    ]
 
     if not basic:
         
@@ -500,7 +726,17 @@ def make_samplers(basic: bool = True):
     return samplers
 
 
-def make_sampling_pipeline(preprocessor, sampler, classifier):
+def _with_cat_mask(sampler, cat_mask):
+    """Return a clone of `sampler` with every (nested) `categorical_features` set to `cat_mask`."""
+    params = {
+        key: cat_mask
+        for key in sampler.get_params(deep=True)
+        if key == "categorical_features" or key.endswith("__categorical_features")
+    }
+    return clone(sampler).set_params(**params) if params else sampler
+
+
+def make_sampling_pipeline(preprocessor, sampler, classifier, *, cat_mask=None):
     """
     Create an imblearn Pipeline: preprocessor -> [sampler(s)] -> classifier.
 
@@ -508,6 +744,10 @@ def make_sampling_pipeline(preprocessor, sampler, classifier):
       - None (no sampling)
       - a single sampler (fit_resample)
       - a list of (name, step) tuples (e.g., SMOTE then UnderSampler)
+
+    `cat_mask` (optional) overrides the categorical mask of SMOTENC samplers; it must
+    follow the preprocessor's output columns. Without it, LazySMOTENC resolves the
+    mask on each transformed fold.
     """
     _require_imblearn()
     from imblearn.pipeline import Pipeline as ImbPipeline
@@ -521,15 +761,43 @@ def make_sampling_pipeline(preprocessor, sampler, classifier):
         for tup in sampler:
             if not (isinstance(tup, tuple) and len(tup) == 2):
                 raise TypeError("sampler list must be a list of (name, estimator) tuples")
+        if cat_mask is not None:
+            sampler = [(name, _with_cat_mask(step, cat_mask)) for name, step in sampler]
         steps.extend(sampler)
     else:
         # Single sampler estimator
+        if cat_mask is not None:
+            sampler = _with_cat_mask(sampler, cat_mask)
         steps.append(("sampler", sampler))
 
     steps.append(("clf", classifier))
     return ImbPipeline(steps)
 
 
+def _fit_score_fold(pipe, Xtr, ytr, Xte, yte) -> np.ndarray:
+    """Fit `pipe` on one pre-transformed fold and return its test metrics and timings (_CV_METRICS order)."""
+    t0 = time.perf_counter()
+    pipe.fit(Xtr, ytr)
+    fit_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    yhat = pipe.predict(Xte)
+    if hasattr(pipe, "predict_proba"):
+        scores = pipe.predict_proba(Xte)[:, 1]
+    else:
+        scores = pipe.decision_function(Xte)
+    metrics = [
+        accuracy_score(yte, yhat),
+        precision_score(yte, yhat, zero_division=0),
+        recall_score(yte, yhat, zero_division=0),
+        f1_score(yte, yhat, zero_division=0),
+        roc_auc_score(yte, scores),
+        average_precision_score(yte, scores),
+    ]
+    score_time = time.perf_counter() - t0
+    return np.array(metrics + [fit_time, score_time])
+
+
 def quick_cv_models_with_sampling(
     preprocessor,
     X: pd.DataFrame,
@@ -547,11 +815,15 @@ def quick_cv_models_with_sampling(
 
     Notes
     -----
-    - Uses imblearn.Pipeline so resampling happens **inside** each fold only.
+    - The preprocessor only depends on the fold's train indices, so it is fitted
+      once per fold and the transformed folds are reused by every (sampler × classifier).
+    - Resampling still happens **inside** each fold only (on the transformed train part).
+    - Folds are fitted in a thread pool (n_jobs): the heavy estimators release the GIL.
+      When n_jobs != 1, classifiers are run with n_jobs=1 to avoid oversubscription.
     - Safe defaults for scorers (accuracy, precision, recall, f1, roc_auc, average_precision).
     """
     _require_imblearn()
-    from sklearn.model_selection import StratifiedKFold, cross_validate
+    from joblib import Parallel, delayed
 
     if samplers is None:
         samplers = make_samplers(basic=True)
@@ -559,47 +831,35 @@ def quick_cv_models_with_sampling(
     if classifiers is None:
         classifiers = _default_classifiers()
 
-    skf = StratifiedKFold(n_splits=cv_splits, shuffle=True, random_state=random_state)
-
-    scorers = {
-        "accuracy": "accuracy",
-        "precision": "precision",
-        "recall": "recall",
-        "f1": "f1",
-        "roc_auc": "roc_auc",
-        "avg_precision": "average_precision",
-    }
-
-    rows = []
+    # Fit/transform the preprocessor once per fold (sparse output is kept as-is)
+    y_arr = np.asarray(y)
+    folds = []
+    for tr, te in _cv_splits(y_arr, cv_splits, random_state):
+        prep = clone(preprocessor)
+        Xtr = prep.fit_transform(X.iloc[tr], y_arr[tr])
+        Xte = prep.transform(X.iloc[te])
+        folds.append((Xtr, y_arr[tr], Xte, y_arr[te]))
+
+    # One pipeline per sampler (preprocessing is already applied per fold, hence "passthrough");
+    # each classifier is swapped in with set_params instead of rebuilding the pipeline.
+    grid = []
     for s_name, sampler in samplers.items():
+        base = make_sampling_pipeline("passthrough", sampler, "passthrough")
         for m_name, clf in classifiers.items():
-            pipe = make_sampling_pipeline(preprocessor, sampler, clf)
-            scores = cross_validate(
-                pipe,
-                X,
-                y,
-                scoring=scorers,
-                cv=skf,
-                n_jobs=n_jobs,
-                return_train_score=False,
-                error_score="raise",
-            )
-            rows.append(
-                {
-                    "sampler": s_name,
-                    "model": m_name,
-                    "accuracy_mean": scores["test_accuracy"].mean(),
-                    "precision_mean": scores["test_precision"].mean(),
-                    "recall_mean": scores["test_recall"].mean(),
-                    "f1_mean": scores["test_f1"].mean(),
-                    "roc_auc_mean": scores["test_roc_auc"].mean(),
-                    "avg_precision_mean": scores["test_avg_precision"].mean(),
-                    "fit_time_s": float(np.mean(scores["fit_time"])),
-                    "score_time_s": float(np.mean(scores["score_time"])),
-                }
-            )
+            grid.append((s_name, m_name, clone(base).set_params(clf=_single_threaded(clf, n_jobs))))
+    results = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_fit_score_fold)(clone(pipe), Xtr, ytr, Xte, yte)
+        for _, _, pipe in grid
+        for Xtr, ytr, Xte, yte in folds
+    )
 
-    df = pd.DataFrame(rows).sort_values(
+    # (grid x folds x metrics) -> mean over folds
+    values = np.asarray(results).reshape(len(grid), cv_splits, len(_CV_METRICS)).mean(axis=1)
+
+    df = pd.DataFrame(values, columns=_CV_COLUMNS)
+    df.insert(0, "sampler", [s_name for s_name, _, _ in grid])
+    df.insert(1, "model", [m_name for _, m_name, _ in grid])
+    df = df.sort_values(
         ["avg_precision_mean", "recall_mean"], ascending=[False, False]
     ).reset_index(drop=True)
     return df
@@ -619,38 +879,52 @@ def cross_val_threshold_metrics(
     """
     Helper to pick a decision threshold using out-of-fold probabilities.
 
-    - Computes OOF positive scores via cross_val_predict(predict_proba).
+    - Computes OOF positive scores via cross_val_predict(predict_proba),
+      or sigmoid(decision_function) for classifiers without predict_proba.
     - Evaluates precision/recall/F1 for a list of thresholds.
     - Returns a small DataFrame to help you choose a threshold.
 
     This ignores samplers on purpose (pure classifier behavior).
     If you need samplers, wrap `clf` in an imblearn pipeline before passing here.
     """
-    from sklearn.model_selection import StratifiedKFold, cross_val_predict
-
     if thresholds is None:
         thresholds = [0.2, 0.3, 0.35, 0.4, 0.5]
 
-    pipe = Pipeline([("prep", preprocessor), ("clf", clf)])
-    skf = StratifiedKFold(n_splits=cv_splits, shuffle=True, random_state=random_state)
+    pipe = Pipeline([("prep", _single_threaded(preprocessor, n_jobs)), ("clf", _single_threaded(clf, n_jobs))])
+    splits = _cv_splits(y, cv_splits, random_state)
 
-    # OOF probabilities
+    # OOF probabilities (cached on disk, see oof_probas)
+    X_hash, y_hash = joblib_hash(X), joblib_hash(y)
     if hasattr(clf, "predict_proba"):
-        oof = cross_val_predict(pipe, X, y, cv=skf, method="predict_proba", n_jobs=n_jobs)[:, 1]
+        oof = _cached_cross_val_predict(
+            pipe, X_hash, y_hash, splits, "predict_proba", X=X, y=y, n_jobs=n_jobs
+        )[:, 1]
     else:
-        # fallback: decision_function → min-max scale to [0,1] for a crude thresholding
-        raw = cross_val_predict(pipe, X, y, cv=skf, method="decision_function", n_jobs=n_jobs)
-        rmin, rmax = np.min(raw), np.max(raw)
-        oof = (raw - rmin) / (rmax - rmin + 1e-12)
-
-    out = []
-    for t in thresholds:
-        yhat = (oof >= t).astype(int)
-        out.append({
-            "threshold": t,
-            "precision": precision_score(y, yhat, zero_division=0),
-            "recall": recall_score(y, yhat, zero_division=0),
-            "f1": f1_score(y, yhat, zero_division=0),
-        })
-    return pd.DataFrame(out).sort_values("threshold")
+        # fallback: decision_function → logistic sigmoid to [0,1] (0.5 = decision boundary)
+        raw = _cached_cross_val_predict(
+            pipe, X_hash, y_hash, splits, "decision_function", X=X, y=y, n_jobs=n_jobs
+        )
+        oof = expit(raw)
+
+    return _threshold_table(y, oof, thresholds)
+
+
+def _threshold_table(y, scores, thresholds) -> pd.DataFrame:
+    """
+    Precision/recall/F1 of `scores >= t` for each threshold t (zero_division=0),
+    sorted by threshold.
+    """
+    # One sort for all thresholds: precision/recall at every distinct score, then pick
+    # for each t the first curve threshold >= t (same positives as `scores >= t`).
+    prec, rec, curve_thr = precision_recall_curve(y, scores)
+    t = np.asarray(thresholds, dtype=float)
+    idx = np.searchsorted(curve_thr, t, side="left")
+    above_all = idx == len(curve_thr)  # no predicted positive: precision 0 (zero_division=0)
+    precisions = np.where(above_all, 0.0, prec[idx])
+    recalls = rec[idx]
+    denom = precisions + recalls
+    f1 = np.divide(2 * precisions * recalls, denom, out=np.zeros_like(denom), where=denom > 0)
+
+    out = pd.DataFrame({"threshold": t, "precision": precisions, "recall": recalls, "f1": f1})
+    return out.sort_values("threshold")
 
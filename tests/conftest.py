@@ -3,76 +3,126 @@ Shared pytest fixtures for all test modules.
 
 This file provides common fixtures that can be used across all test files.
 """
+import asyncio
+import contextlib
+from types import MappingProxyType
+import numpy as np
 import pytest
+import pytest_asyncio
 import httpx
 from fastapi.testclient import TestClient
 from oc5_ml_deployment.api.main import app
+from oc5_ml_deployment.api.model_service import get_model_service
+from payloads import VALID_EMPLOYEE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop, as uvicorn[standard] does in production.
+
+    Falls back to the default asyncio policy when uvloop is not installed
+    (e.g. on Windows).
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.get_event_loop_policy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a FastAPI test client.
+    """Create a FastAPI test client shared by the whole test session.
 
     This fixture provides a TestClient instance that can be used to make
-    HTTP requests to the API during testing.
+    HTTP requests to the API during testing. The app holds no per-test state,
+    so one client is reused; tests that need to swap dependencies should use
+    app.dependency_overrides, which are cleared on teardown.
 
     Note: For database tests that require async operations, use async_client instead.
     """
-    return TestClient(app)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def warm_model(client):
+    """Serve one real prediction before the first test that requests it.
+
+    Model loading and first-inference setup then happen outside any test,
+    so they do not skew the timing of whichever test happens to run first.
+    Request it (usefixtures) only from modules that run inference.
+    """
+    response = client.post("/api/v1/predict", json=VALID_EMPLOYEE)
+    assert response.status_code == 200, f"Model warm-up failed: {response.text}"
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def async_client():
-    """Create an async HTTP client for testing.
+    """Create an async HTTP client shared by the whole test session.
 
     This fixture provides an httpx.AsyncClient instance that can be used for
     async HTTP requests. Unlike TestClient, this works properly with async
-    database operations.
+    database operations. The app lifespan (model check, database writer) is
+    entered once for the session.
+
+    Tests using it must run on the session event loop.
 
     Usage:
-        @pytest.mark.asyncio
+        @pytest.mark.asyncio(loop_scope="session")
         async def test_something(async_client):
             response = await async_client.post("/api/v1/predict", json=data)
             assert response.status_code == 200
     """
-    async with httpx.AsyncClient(
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
         transport=httpx.ASGITransport(app=app),
         base_url="http://test"
     ) as ac:
         yield ac
 
 
+@contextlib.contextmanager
+def _stubbed_inference():
+    """Replace model inference with a fixed 35% probability of leaving."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            get_model_service().model,
+            "predict_proba",
+            lambda X: np.tile([0.65, 0.35], (len(X), 1)),
+        )
+        yield
+
+
+@pytest.fixture(scope="session")
+def stubbed_inference():
+    """Context manager stubbing model inference like fake_model does.
+
+    For module- or session-scoped fixtures, which are set up before the
+    function-scoped fake_model patch is applied.
+    """
+    return _stubbed_inference
+
+
 @pytest.fixture
+def fake_model(request):
+    """Replace model inference with a fixed 35% probability of leaving.
+
+    Use it for tests that check request validation and response shape, which
+    do not depend on the trained model's output. Tests marked real_model keep
+    the real model.
+    """
+    if request.node.get_closest_marker("real_model"):
+        yield
+        return
+    with _stubbed_inference():
+        yield
+
+
+@pytest.fixture(scope="session")
 def valid_employee_data():
-    """Valid employee data for testing predictions.
+    """Valid employee data for testing predictions (read-only).
 
-    Returns a dictionary with all required employee features for making
-    a prediction request.
+    Contains all required employee features plus an employee_id, so it is
+    also a valid batch item. Merge it into a new dict to vary it.
     """
-    return {
-        "employee_id": "TEST_001",
-        "age": 35,
-        "genre": "Male",
-        "statut_marital": "Married",
-        "departement": "Sales",
-        "poste": "Sales Executive",
-        "domaine_etude": "Life Sciences",
-        "revenu_mensuel": 5000,
-        "nombre_experiences_precedentes": 3,
-        "nombre_heures_travailless": 40,
-        "annees_dans_le_poste_actuel": 2,
-        "satisfaction_employee_environnement": 4,
-        "note_evaluation_precedente": 3,
-        "satisfaction_employee_nature_travail": 4,
-        "satisfaction_employee_equipe": 3,
-        "satisfaction_employee_equilibre_pro_perso": 3,
-        "note_evaluation_actuelle": 3,
-        "nombre_participation_pee": 1,
-        "nb_formations_suivies": 2,
-        "nombre_employee_sous_responsabilite": 0,
-        "distance_domicile_travail": 10,
-        "niveau_education": 3,
-        "annees_depuis_la_derniere_promotion": 1,
-        "annes_sous_responsable_actuel": 2,
-        "heure_supplementaires": "No",
-    }
+    return MappingProxyType(VALID_EMPLOYEE)
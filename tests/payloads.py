@@ -0,0 +1,35 @@
+"""
+Request payloads shared by the test modules.
+
+Importable from any test module (tests/ is on the pytest pythonpath); tests
+that need a fixture should use valid_employee_data from conftest instead.
+"""
+
+# Valid prediction payload (also a valid batch item thanks to employee_id)
+VALID_EMPLOYEE = {
+    "employee_id": "TEST_001",
+    "age": 35,
+    "genre": "Male",
+    "statut_marital": "Married",
+    "departement": "Sales",
+    "poste": "Sales Executive",
+    "domaine_etude": "Life Sciences",
+    "revenu_mensuel": 5000,
+    "nombre_experiences_precedentes": 3,
+    "nombre_heures_travailless": 40,
+    "annees_dans_le_poste_actuel": 2,
+    "satisfaction_employee_environnement": 4,
+    "note_evaluation_precedente": 3,
+    "satisfaction_employee_nature_travail": 4,
+    "satisfaction_employee_equipe": 3,
+    "satisfaction_employee_equilibre_pro_perso": 3,
+    "note_evaluation_actuelle": 3,
+    "nombre_participation_pee": 1,
+    "nb_formations_suivies": 2,
+    "nombre_employee_sous_responsabilite": 0,
+    "distance_domicile_travail": 10,
+    "niveau_education": 3,
+    "annees_depuis_la_derniere_promotion": 1,
+    "annes_sous_responsable_actuel": 2,
+    "heure_supplementaires": "No",
+}
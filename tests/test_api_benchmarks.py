@@ -0,0 +1,33 @@
+"""
+Benchmarks for the prediction endpoints.
+
+Run with the real model under pytest-benchmark. They are excluded from the
+default run; invoke them explicitly with:
+
+    pytest -m benchmark tests/test_api_benchmarks.py
+
+Save a baseline with --benchmark-autosave and catch regressions with
+--benchmark-compare --benchmark-compare-fail=mean:20%.
+"""
+import pytest
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.usefixtures("warm_model")]
+
+
+def test_predict_latency(benchmark, client, valid_employee_data):
+    """Benchmark a single prediction round trip."""
+    response = benchmark(client.post, "/api/v1/predict", json=dict(valid_employee_data))
+    assert response.status_code == 200
+
+
+def test_batch_predict_latency(benchmark, client, valid_employee_data):
+    """Benchmark a 10-employee batch prediction round trip."""
+    batch_data = {
+        "employees": [
+            {**valid_employee_data, "employee_id": f"EMP{i:03d}"} for i in range(10)
+        ]
+    }
+
+    response = benchmark(client.post, "/api/v1/predict/batch", json=batch_data)
+    assert response.status_code == 200
+    assert response.json()["metadata"]["total_predictions"] == 10
@@ -12,235 +12,147 @@ Test coverage:
 """
 
 import pytest
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 from oc5_ml_deployment.api.schemas import (
     EmployeeFeatures,
     PredictionResponse,
+    PredictionResult,
     BatchPredictionRequest,
-    BatchPredictionResponse,
     HealthResponse,
-    ModelInfoResponse,
 )
+from payloads import VALID_EMPLOYEE
 
+# Reused validators: avoid re-dispatching through the model metaclass per call
+_EMP_TA = TypeAdapter(EmployeeFeatures)
+_BATCH_TA = TypeAdapter(BatchPredictionRequest)
 
-# Test fixtures
-@pytest.fixture
-def valid_employee_data():
-    """Valid employee data for testing."""
-    return {
-        "age": 35,
-        "revenu_mensuel": 5000.0,
-        "nombre_experiences_precedentes": 3,
-        "nombre_heures_travailless": 40,
-        "annees_dans_le_poste_actuel": 2,
-        "satisfaction_employee_environnement": 4,
-        "note_evaluation_precedente": 3,
-        "satisfaction_employee_nature_travail": 4,
-        "satisfaction_employee_equipe": 3,
-        "satisfaction_employee_equilibre_pro_perso": 3,
-        "note_evaluation_actuelle": 3,
-        "nombre_participation_pee": 1,
-        "nb_formations_suivies": 2,
-        "nombre_employee_sous_responsabilite": 0,
-        "distance_domicile_travail": 10,
-        "niveau_education": 3,
-        "annees_depuis_la_derniere_promotion": 1,
-        "annes_sous_responsable_actuel": 2,
-        "genre": "Male",
-        "statut_marital": "Married",
-        "departement": "Sales",
-        "poste": "Sales Executive",
-        "domaine_etude": "Life Sciences",
-        "heure_supplementaires": "No",
-    }
+
+# Deterministic oversized batch (101 > max 100), built once at import
+_BATCH_101 = {"employees": [{**VALID_EMPLOYEE, "employee_id": f"EMP{i:03d}"} for i in range(101)]}
+
+
+@pytest.fixture(scope="session")
+def valid_employee(valid_employee_data):
+    """EmployeeFeatures instance validated once from the base payload."""
+    return _EMP_TA.validate_python(valid_employee_data)
 
 
 # ===== EmployeeFeatures Schema Tests =====
 
+# (field, value) pairs just outside each field's allowed range
+BAD_SCALARS = [
+    ("age", 17),
+    ("age", 71),
+    ("revenu_mensuel", -100),
+    ("revenu_mensuel", 0),  # gt=0, not ge=0
+    ("satisfaction_employee_environnement", 0),
+    ("satisfaction_employee_environnement", 6),
+    ("note_evaluation_actuelle", 5),
+    ("nombre_experiences_precedentes", -1),
+]
+
 
 class TestEmployeeFeaturesValidation:
     """Test validation rules for EmployeeFeatures schema."""
 
     def test_valid_employee_data_is_accepted(self, valid_employee_data):
         """Valid employee data should pass validation."""
-        employee = EmployeeFeatures(**valid_employee_data)
+        employee = _EMP_TA.validate_python(valid_employee_data)
         assert employee.age == 35
         assert employee.revenu_mensuel == 5000.0
         assert employee.genre == "Male"
 
     def test_missing_required_field_raises_error(self, valid_employee_data):
         """Missing required fields should raise ValidationError."""
-        invalid_data = valid_employee_data.copy()
-        del invalid_data["age"]
+        invalid_data = {k: v for k, v in valid_employee_data.items() if k != "age"}
 
         with pytest.raises(ValidationError) as exc_info:
-            EmployeeFeatures(**invalid_data)
+            _EMP_TA.validate_python(invalid_data)
 
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("age",) and e["type"] == "missing" for e in errors)
-
-    def test_age_below_minimum_raises_error(self, valid_employee_data):
-        """Age below 18 should be rejected."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["age"] = 17
+        [error] = exc_info.value.errors(include_url=False)
+        assert error["loc"] == ("age",) and error["type"] == "missing"
 
+    @pytest.mark.parametrize("field, bad", BAD_SCALARS)
+    def test_out_of_range_rejected(self, valid_employee_data, field, bad):
+        """Numeric fields outside their allowed range should be rejected."""
         with pytest.raises(ValidationError) as exc_info:
-            EmployeeFeatures(**invalid_data)
-
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("age",) for e in errors)
+            _EMP_TA.validate_python({**valid_employee_data, field: bad})
 
-    def test_age_above_maximum_raises_error(self, valid_employee_data):
-        """Age above 70 should be rejected."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["age"] = 71
-
-        with pytest.raises(ValidationError) as exc_info:
-            EmployeeFeatures(**invalid_data)
-
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("age",) for e in errors)
+        [error] = exc_info.value.errors(include_url=False)
+        assert error["loc"] == (field,)
 
     def test_age_at_boundaries_is_accepted(self, valid_employee_data):
         """Age at exact boundaries (18, 70) should be accepted."""
         # Test minimum
-        data_min = valid_employee_data.copy()
-        data_min["age"] = 18
-        employee_min = EmployeeFeatures(**data_min)
+        data_min = {**valid_employee_data, "age": 18}
+        employee_min = _EMP_TA.validate_python(data_min)
         assert employee_min.age == 18
 
         # Test maximum
-        data_max = valid_employee_data.copy()
-        data_max["age"] = 70
-        employee_max = EmployeeFeatures(**data_max)
+        data_max = {**valid_employee_data, "age": 70}
+        employee_max = _EMP_TA.validate_python(data_max)
         assert employee_max.age == 70
 
-    def test_negative_revenu_raises_error(self, valid_employee_data):
-        """Negative or zero revenue should be rejected."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["revenu_mensuel"] = -100
-
-        with pytest.raises(ValidationError) as exc_info:
-            EmployeeFeatures(**invalid_data)
-
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("revenu_mensuel",) for e in errors)
-
-    def test_zero_revenu_raises_error(self, valid_employee_data):
-        """Zero revenue should be rejected (gt=0, not ge=0)."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["revenu_mensuel"] = 0
-
-        with pytest.raises(ValidationError) as exc_info:
-            EmployeeFeatures(**invalid_data)
-
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("revenu_mensuel",) for e in errors)
-
-    def test_satisfaction_scores_out_of_range_raises_error(self, valid_employee_data):
-        """Satisfaction scores outside 1-5 range should be rejected."""
-        # Test below minimum
-        invalid_data = valid_employee_data.copy()
-        invalid_data["satisfaction_employee_environnement"] = 0
-
-        with pytest.raises(ValidationError):
-            EmployeeFeatures(**invalid_data)
-
-        # Test above maximum
-        invalid_data["satisfaction_employee_environnement"] = 6
-
-        with pytest.raises(ValidationError):
-            EmployeeFeatures(**invalid_data)
-
-    def test_note_evaluation_out_of_range_raises_error(self, valid_employee_data):
-        """Performance ratings outside 1-4 range should be rejected."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["note_evaluation_actuelle"] = 5
-
-        with pytest.raises(ValidationError):
-            EmployeeFeatures(**invalid_data)
-
     def test_invalid_genre_raises_error(self, valid_employee_data):
         """Invalid gender values should be rejected."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["genre"] = "Unknown"
+        invalid_data = {**valid_employee_data, "genre": "Unknown"}
 
         with pytest.raises(ValidationError) as exc_info:
-            EmployeeFeatures(**invalid_data)
+            _EMP_TA.validate_python(invalid_data)
 
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("genre",) for e in errors)
+        [error] = exc_info.value.errors(include_url=False)
+        assert error["loc"] == ("genre",)
 
-    def test_valid_genre_variants_are_accepted(self, valid_employee_data):
+    @pytest.mark.parametrize("genre", ["Male", "Female", "M", "F", "Homme", "Femme"])
+    def test_valid_genre_variants_are_accepted(self, valid_employee_data, genre):
         """Different valid gender formats should be accepted."""
-        valid_genres = ["Male", "Female", "M", "F", "Homme", "Femme"]
-
-        for genre in valid_genres:
-            data = valid_employee_data.copy()
-            data["genre"] = genre
-            employee = EmployeeFeatures(**data)
-            assert employee.genre == genre
+        employee = _EMP_TA.validate_python({**valid_employee_data, "genre": genre})
+        assert employee.genre == genre
 
     def test_invalid_statut_marital_raises_error(self, valid_employee_data):
         """Invalid marital status should be rejected."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["statut_marital"] = "Complicated"
+        invalid_data = {**valid_employee_data, "statut_marital": "Complicated"}
 
         with pytest.raises(ValidationError) as exc_info:
-            EmployeeFeatures(**invalid_data)
+            _EMP_TA.validate_python(invalid_data)
 
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("statut_marital",) for e in errors)
+        [error] = exc_info.value.errors(include_url=False)
+        assert error["loc"] == ("statut_marital",)
 
-    def test_valid_statut_marital_variants_are_accepted(self, valid_employee_data):
+    @pytest.mark.parametrize(
+        "status", ["Single", "Married", "Divorced", "Célibataire", "Marié", "Divorcé"]
+    )
+    def test_valid_statut_marital_variants_are_accepted(self, valid_employee_data, status):
         """Different valid marital status formats should be accepted."""
-        valid_statuses = ["Single", "Married", "Divorced", "Célibataire", "Marié", "Divorcé"]
+        employee = _EMP_TA.validate_python({**valid_employee_data, "statut_marital": status})
+        assert employee.statut_marital == status
 
-        for status in valid_statuses:
-            data = valid_employee_data.copy()
-            data["statut_marital"] = status
-            employee = EmployeeFeatures(**data)
-            assert employee.statut_marital == status
+    @pytest.mark.parametrize("value", ["Yes", "No"])
+    def test_heure_supplementaires_accepts_yes_no(self, valid_employee_data, value):
+        """Overtime field should accept 'Yes' and 'No'."""
+        employee = _EMP_TA.validate_python({**valid_employee_data, "heure_supplementaires": value})
+        assert employee.heure_supplementaires == value
 
-    def test_heure_supplementaires_only_accepts_yes_no(self, valid_employee_data):
+    def test_heure_supplementaires_rejects_other_values(self, valid_employee_data):
         """Overtime field should only accept 'Yes' or 'No'."""
-        # Valid values
-        for value in ["Yes", "No"]:
-            data = valid_employee_data.copy()
-            data["heure_supplementaires"] = value
-            employee = EmployeeFeatures(**data)
-            assert employee.heure_supplementaires == value
-
-        # Invalid value
-        invalid_data = valid_employee_data.copy()
-        invalid_data["heure_supplementaires"] = "Maybe"
+        invalid_data = {**valid_employee_data, "heure_supplementaires": "Maybe"}
 
         with pytest.raises(ValidationError):
-            EmployeeFeatures(**invalid_data)
+            _EMP_TA.validate_python(invalid_data)
 
     def test_wrong_field_types_raise_error(self, valid_employee_data):
         """Fields with wrong types should be rejected."""
         # String instead of int
-        invalid_data = valid_employee_data.copy()
-        invalid_data["age"] = "thirty-five"
+        invalid_data = {**valid_employee_data, "age": "thirty-five"}
 
         with pytest.raises(ValidationError):
-            EmployeeFeatures(**invalid_data)
+            _EMP_TA.validate_python(invalid_data)
 
         # Int instead of string
-        invalid_data = valid_employee_data.copy()
-        invalid_data["genre"] = 123
-
-        with pytest.raises(ValidationError):
-            EmployeeFeatures(**invalid_data)
-
-    def test_negative_values_for_count_fields_raise_error(self, valid_employee_data):
-        """Count fields should not accept negative values."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["nombre_experiences_precedentes"] = -1
+        invalid_data = {**valid_employee_data, "genre": 123}
 
         with pytest.raises(ValidationError):
-            EmployeeFeatures(**invalid_data)
+            _EMP_TA.validate_python(invalid_data)
 
 
 # ===== BatchPredictionRequest Schema Tests =====
@@ -249,16 +161,17 @@ class TestEmployeeFeaturesValidation:
 class TestBatchPredictionRequest:
     """Test batch prediction request validation."""
 
-    def test_valid_batch_request_is_accepted(self, valid_employee_data):
+    def test_valid_batch_request_is_accepted(self, valid_employee):
         """Valid batch request with employee IDs should pass."""
+        employee = valid_employee.model_dump()
         batch_data = {
             "employees": [
-                {"employee_id": "EMP001", **valid_employee_data},
-                {"employee_id": "EMP002", **valid_employee_data},
+                {"employee_id": "EMP001", **employee},
+                {"employee_id": "EMP002", **employee},
             ]
         }
 
-        batch_request = BatchPredictionRequest(**batch_data)
+        batch_request = _BATCH_TA.validate_python(batch_data)
         assert len(batch_request.employees) == 2
         assert batch_request.employees[0].employee_id == "EMP001"
 
@@ -267,35 +180,40 @@ class TestBatchPredictionRequest:
         batch_data = {"employees": []}
 
         with pytest.raises(ValidationError) as exc_info:
-            BatchPredictionRequest(**batch_data)
+            _BATCH_TA.validate_python(batch_data)
 
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("employees",) for e in errors)
+        [error] = exc_info.value.errors(include_url=False)
+        assert error["loc"] == ("employees",)
 
-    def test_batch_size_limit_enforced(self, valid_employee_data):
+    def test_batch_size_limit_enforced(self):
         """Batch requests exceeding max size (100) should be rejected."""
-        batch_data = {
-            "employees": [
-                {"employee_id": f"EMP{i:03d}", **valid_employee_data}
-                for i in range(101)
-            ]
-        }
-
         with pytest.raises(ValidationError) as exc_info:
-            BatchPredictionRequest(**batch_data)
+            _BATCH_TA.validate_python(_BATCH_101)
 
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("employees",) for e in errors)
+        [error] = exc_info.value.errors(include_url=False)
+        assert error["loc"] == ("employees",)
 
     def test_missing_employee_id_raises_error(self, valid_employee_data):
         """Batch items missing employee_id should be rejected."""
-        batch_data = {"employees": [valid_employee_data]}  # Missing employee_id
+        employee = {k: v for k, v in valid_employee_data.items() if k != "employee_id"}
+        batch_data = {"employees": [employee]}  # Missing employee_id
 
         with pytest.raises(ValidationError) as exc_info:
-            BatchPredictionRequest(**batch_data)
+            _BATCH_TA.validate_python(batch_data)
 
-        errors = exc_info.value.errors()
-        assert any("employee_id" in str(e["loc"]) for e in errors)
+        [error] = exc_info.value.errors(include_url=False)
+        assert error["loc"] == ("employees", 0, "employee_id")
+
+    def test_employee_id_longer_than_db_column_raises_error(self, valid_employee_data):
+        """Batch employee IDs must fit the 50-character database column."""
+        batch_data = {"employees": [{**valid_employee_data, "employee_id": "E" * 51}]}
+
+        with pytest.raises(ValidationError) as exc_info:
+            _BATCH_TA.validate_python(batch_data)
+
+        [error] = exc_info.value.errors(include_url=False)
+        assert error["loc"] == ("employees", 0, "employee_id")
+        assert error["type"] == "string_too_long"
 
 
 # ===== Response Schema Tests =====
@@ -324,36 +242,31 @@ class TestPredictionResponse:
         assert response.prediction.will_leave is False
         assert response.prediction.probability_leave == 23.4
         assert response.prediction.risk_level == "LOW"
+        assert response.metadata.prediction_time_ms == 12
 
     def test_probability_outside_range_raises_error(self):
         """Probabilities outside 0-100 range should be rejected."""
-        response_data = {
-            "prediction": {
-                "will_leave": False,
-                "probability_leave": 150.0,  # Invalid
-                "probability_stay": 76.6,
-                "risk_level": "LOW",
-            },
-            "metadata": {"model_version": "v1", "prediction_time_ms": 12, "timestamp": "2025-11-14T10:30:00Z"},
+        result_data = {
+            "will_leave": False,
+            "probability_leave": 150.0,  # Invalid
+            "probability_stay": 76.6,
+            "risk_level": "LOW",
         }
 
         with pytest.raises(ValidationError):
-            PredictionResponse(**response_data)
+            PredictionResult(**result_data)
 
     def test_invalid_risk_level_raises_error(self):
         """Risk levels other than low/medium/high should be rejected."""
-        response_data = {
-            "prediction": {
-                "will_leave": False,
-                "probability_leave": 23.4,
-                "probability_stay": 76.6,
-                "risk_level": "critical",  # Invalid
-            },
-            "metadata": {"model_version": "v1", "prediction_time_ms": 12, "timestamp": "2025-11-14T10:30:00Z"},
+        result_data = {
+            "will_leave": False,
+            "probability_leave": 23.4,
+            "probability_stay": 76.6,
+            "risk_level": "critical",  # Invalid
         }
 
         with pytest.raises(ValidationError):
-            PredictionResponse(**response_data)
+            PredictionResult(**result_data)
 
 
 class TestHealthResponse:
@@ -392,72 +305,66 @@ class TestEdgeCases:
 
     def test_all_minimum_values_are_accepted(self, valid_employee_data):
         """Test with all fields at their minimum allowed values."""
-        edge_data = valid_employee_data.copy()
-        edge_data.update(
-            {
-                "age": 18,
-                "revenu_mensuel": 0.01,
-                "nombre_experiences_precedentes": 0,
-                "nombre_heures_travailless": 0,
-                "annees_dans_le_poste_actuel": 0,
-                "satisfaction_employee_environnement": 1,
-                "note_evaluation_precedente": 1,
-                "satisfaction_employee_nature_travail": 1,
-                "satisfaction_employee_equipe": 1,
-                "satisfaction_employee_equilibre_pro_perso": 1,
-                "note_evaluation_actuelle": 1,
-                "nombre_participation_pee": 0,
-                "nb_formations_suivies": 0,
-                "nombre_employee_sous_responsabilite": 0,
-                "distance_domicile_travail": 0,
-                "niveau_education": 1,
-                "annees_depuis_la_derniere_promotion": 0,
-                "annes_sous_responsable_actuel": 0,
-            }
-        )
-
-        employee = EmployeeFeatures(**edge_data)
+        edge_data = {
+            **valid_employee_data,
+            "age": 18,
+            "revenu_mensuel": 0.01,
+            "nombre_experiences_precedentes": 0,
+            "nombre_heures_travailless": 0,
+            "annees_dans_le_poste_actuel": 0,
+            "satisfaction_employee_environnement": 1,
+            "note_evaluation_precedente": 1,
+            "satisfaction_employee_nature_travail": 1,
+            "satisfaction_employee_equipe": 1,
+            "satisfaction_employee_equilibre_pro_perso": 1,
+            "note_evaluation_actuelle": 1,
+            "nombre_participation_pee": 0,
+            "nb_formations_suivies": 0,
+            "nombre_employee_sous_responsabilite": 0,
+            "distance_domicile_travail": 0,
+            "niveau_education": 1,
+            "annees_depuis_la_derniere_promotion": 0,
+            "annes_sous_responsable_actuel": 0,
+        }
+
+        employee = _EMP_TA.validate_python(edge_data)
         assert employee.age == 18
         assert employee.satisfaction_employee_environnement == 1
 
     def test_all_maximum_values_are_accepted(self, valid_employee_data):
         """Test with all fields at their maximum allowed values."""
-        edge_data = valid_employee_data.copy()
-        edge_data.update(
-            {
-                "age": 70,
-                "nombre_experiences_precedentes": 50,
-                "nombre_heures_travailless": 168,
-                "annees_dans_le_poste_actuel": 50,
-                "satisfaction_employee_environnement": 5,
-                "note_evaluation_precedente": 4,
-                "satisfaction_employee_nature_travail": 5,
-                "satisfaction_employee_equipe": 5,
-                "satisfaction_employee_equilibre_pro_perso": 5,
-                "note_evaluation_actuelle": 4,
-                "nb_formations_suivies": 20,
-                "niveau_education": 5,
-                "annees_depuis_la_derniere_promotion": 50,
-                "annes_sous_responsable_actuel": 50,
-            }
-        )
-
-        employee = EmployeeFeatures(**edge_data)
+        edge_data = {
+            **valid_employee_data,
+            "age": 70,
+            "nombre_experiences_precedentes": 50,
+            "nombre_heures_travailless": 168,
+            "annees_dans_le_poste_actuel": 50,
+            "satisfaction_employee_environnement": 5,
+            "note_evaluation_precedente": 4,
+            "satisfaction_employee_nature_travail": 5,
+            "satisfaction_employee_equipe": 5,
+            "satisfaction_employee_equilibre_pro_perso": 5,
+            "note_evaluation_actuelle": 4,
+            "nb_formations_suivies": 20,
+            "niveau_education": 5,
+            "annees_depuis_la_derniere_promotion": 50,
+            "annes_sous_responsable_actuel": 50,
+        }
+
+        employee = _EMP_TA.validate_python(edge_data)
         assert employee.age == 70
         assert employee.satisfaction_employee_environnement == 5
 
     def test_special_characters_in_text_fields(self, valid_employee_data):
         """Test that text fields handle accents and special characters."""
-        special_data = valid_employee_data.copy()
-        special_data.update(
-            {
-                "poste": "Développeur Sénior",
-                "departement": "Recherche & Développement",
-                "domaine_etude": "Sciences de l'ingénieur",
-            }
-        )
-
-        employee = EmployeeFeatures(**special_data)
+        special_data = {
+            **valid_employee_data,
+            "poste": "Développeur Sénior",
+            "departement": "Recherche & Développement",
+            "domaine_etude": "Sciences de l'ingénieur",
+        }
+
+        employee = _EMP_TA.validate_python(special_data)
         assert "é" in employee.poste
         assert "&" in employee.departement
         assert "'" in employee.domaine_etude
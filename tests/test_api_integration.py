@@ -6,46 +6,50 @@ predictions, and error handling.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-
-from oc5_ml_deployment.api.main import app
-
-
-@pytest.fixture
-def client():
-    """Create a test client."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def valid_employee_data():
-    """Valid employee data for testing predictions."""
-    return {
-        "age": 35,
-        "revenu_mensuel": 5000.0,
-        "nombre_experiences_precedentes": 3,
-        "nombre_heures_travailless": 40,
-        "annees_dans_le_poste_actuel": 2,
-        "satisfaction_employee_environnement": 4,
-        "note_evaluation_precedente": 3,
-        "satisfaction_employee_nature_travail": 4,
-        "satisfaction_employee_equipe": 3,
-        "satisfaction_employee_equilibre_pro_perso": 3,
-        "note_evaluation_actuelle": 3,
-        "nombre_participation_pee": 1,
-        "nb_formations_suivies": 2,
-        "nombre_employee_sous_responsabilite": 0,
-        "distance_domicile_travail": 10,
-        "niveau_education": 3,
-        "annees_depuis_la_derniere_promotion": 1,
-        "annes_sous_responsable_actuel": 2,
-        "genre": "Male",
-        "statut_marital": "Married",
-        "departement": "Sales",
-        "poste": "Sales Executive",
-        "domaine_etude": "Life Sciences",
-        "heure_supplementaires": "No",
-    }
+import pytest_asyncio
+
+# Shape and validation tests run against a stubbed model; tests marked
+# real_model exercise actual inference (timings live in test_api_benchmarks.py).
+# All tests run on the session event loop so they can share the session
+# async_client (and its single app lifespan), and one xdist worker so the
+# module fixtures are built once.
+pytestmark = [
+    pytest.mark.usefixtures("warm_model", "fake_model"),
+    pytest.mark.asyncio(loop_scope="session"),
+    pytest.mark.xdist_group(name="api"),
+]
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def default_prediction(async_client, valid_employee_data, stubbed_inference):
+    """Response to a single prediction for valid_employee_data, shared by shape tests.
+
+    Built with stubbed inference, like the tests that read it (fake_model).
+    """
+    with stubbed_inference():
+        return await async_client.post("/api/v1/predict", json=dict(valid_employee_data))
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def real_prediction(async_client, valid_employee_data):
+    """Response to a single prediction for valid_employee_data from the real model.
+
+    Module-scoped fixtures are set up before fake_model patches a test, so
+    this is shared by the real_model tests.
+    """
+    return await async_client.post("/api/v1/predict", json=dict(valid_employee_data))
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def batch2_response(async_client, valid_employee_data, stubbed_inference):
+    """Response to a two-employee batch prediction (stubbed inference), shared by shape tests."""
+    with stubbed_inference():
+        return await async_client.post("/api/v1/predict/batch", json={
+            "employees": [
+                {**valid_employee_data, "employee_id": "EMP001"},
+                {**valid_employee_data, "employee_id": "EMP002"},
+            ]
+        })
 
 
 # ===== Health Endpoint Tests =====
@@ -54,14 +58,14 @@ def valid_employee_data():
 class TestHealthEndpoint:
     """Tests for the health check endpoint."""
 
-    def test_health_returns_200(self, client):
+    async def test_health_returns_200(self, async_client):
         """Health endpoint should return 200."""
-        response = client.get("/health")
+        response = await async_client.get("/health")
         assert response.status_code == 200
 
-    def test_health_response_format(self, client):
+    async def test_health_response_format(self, async_client):
         """Health response should have correct format."""
-        response = client.get("/health")
+        response = await async_client.get("/health")
         data = response.json()
 
         assert "status" in data
@@ -70,9 +74,9 @@ class TestHealthEndpoint:
         assert data["status"] in ["healthy", "unhealthy"]
         assert isinstance(data["model_loaded"], bool)
 
-    def test_health_shows_model_loaded(self, client):
+    async def test_health_shows_model_loaded(self, async_client):
         """Health should indicate model is loaded."""
-        response = client.get("/health")
+        response = await async_client.get("/health")
         data = response.json()
 
         assert data["model_loaded"] is True
@@ -86,14 +90,14 @@ class TestHealthEndpoint:
 class TestModelInfoEndpoint:
     """Tests for the model info endpoint."""
 
-    def test_model_info_returns_200(self, client):
+    async def test_model_info_returns_200(self, async_client):
         """Model info endpoint should return 200."""
-        response = client.get("/api/v1/model/info")
+        response = await async_client.get("/api/v1/model/info")
         assert response.status_code == 200
 
-    def test_model_info_response_format(self, client):
+    async def test_model_info_response_format(self, async_client):
         """Model info should have correct structure."""
-        response = client.get("/api/v1/model/info")
+        response = await async_client.get("/api/v1/model/info")
         data = response.json()
 
         assert "model_version" in data
@@ -101,9 +105,9 @@ class TestModelInfoEndpoint:
         assert "performance_metrics" in data
         assert "features_required" in data
 
-    def test_model_info_includes_performance_metrics(self, client):
+    async def test_model_info_includes_performance_metrics(self, async_client):
         """Model info should include performance metrics."""
-        response = client.get("/api/v1/model/info")
+        response = await async_client.get("/api/v1/model/info")
         data = response.json()
 
         metrics = data["performance_metrics"]
@@ -118,9 +122,9 @@ class TestModelInfoEndpoint:
         assert 0 <= metrics["precision"] <= 1
         assert 0 <= metrics["recall"] <= 1
 
-    def test_model_info_includes_feature_lists(self, client):
+    async def test_model_info_includes_feature_lists(self, async_client):
         """Model info should list required features."""
-        response = client.get("/api/v1/model/info")
+        response = await async_client.get("/api/v1/model/info")
         data = response.json()
 
         features = data["features_required"]
@@ -138,15 +142,13 @@ class TestModelInfoEndpoint:
 class TestPredictEndpoint:
     """Tests for single prediction endpoint."""
 
-    def test_predict_valid_input_returns_200(self, client, valid_employee_data):
+    async def test_predict_valid_input_returns_200(self, default_prediction):
         """Valid prediction request should return 200."""
-        response = client.post("/api/v1/predict", json=valid_employee_data)
-        assert response.status_code == 200
+        assert default_prediction.status_code == 200
 
-    def test_predict_response_format(self, client, valid_employee_data):
+    async def test_predict_response_format(self, default_prediction):
         """Prediction response should have correct format."""
-        response = client.post("/api/v1/predict", json=valid_employee_data)
-        data = response.json()
+        data = default_prediction.json()
 
         assert "prediction" in data
         assert "metadata" in data
@@ -157,10 +159,9 @@ class TestPredictEndpoint:
         assert "probability_stay" in prediction
         assert "risk_level" in prediction
 
-    def test_predict_probabilities_are_percentages(self, client, valid_employee_data):
+    async def test_predict_probabilities_are_percentages(self, default_prediction):
         """Probabilities should be in percentage format (0-100)."""
-        response = client.post("/api/v1/predict", json=valid_employee_data)
-        data = response.json()
+        data = default_prediction.json()
 
         prediction = data["prediction"]
         prob_leave = prediction["probability_leave"]
@@ -169,18 +170,16 @@ class TestPredictEndpoint:
         assert 0 <= prob_leave <= 100
         assert 0 <= prob_stay <= 100
 
-    def test_predict_risk_level_is_valid(self, client, valid_employee_data):
+    async def test_predict_risk_level_is_valid(self, default_prediction):
         """Risk level should be low, medium, or high."""
-        response = client.post("/api/v1/predict", json=valid_employee_data)
-        data = response.json()
+        data = default_prediction.json()
 
         risk_level = data["prediction"]["risk_level"]
         assert risk_level in ["LOW", "MEDIUM", "HIGH"]
 
-    def test_predict_includes_metadata(self, client, valid_employee_data):
+    async def test_predict_includes_metadata(self, default_prediction):
         """Response should include prediction metadata."""
-        response = client.post("/api/v1/predict", json=valid_employee_data)
-        data = response.json()
+        data = default_prediction.json()
 
         metadata = data["metadata"]
         assert "model_version" in metadata
@@ -188,46 +187,14 @@ class TestPredictEndpoint:
         assert "timestamp" in metadata
         assert isinstance(metadata["prediction_time_ms"], int)
 
-    def test_predict_missing_fields_returns_422(self, client):
-        """Request with missing fields should return 422."""
-        incomplete_data = {"age": 35}
-        response = client.post("/api/v1/predict", json=incomplete_data)
-        assert response.status_code == 422
+    @pytest.mark.real_model
+    async def test_predict_consistency(self, async_client, valid_employee_data, real_prediction):
+        """Same features should produce the same prediction, whatever the employee_id."""
+        payload = {**valid_employee_data, "employee_id": "OTHER_ID"}
 
-    def test_predict_invalid_age_returns_422(self, client, valid_employee_data):
-        """Invalid age should return 422."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["age"] = 17  # Below minimum
+        response = await async_client.post("/api/v1/predict", json=payload)
 
-        response = client.post("/api/v1/predict", json=invalid_data)
-        assert response.status_code == 422
-
-    def test_predict_invalid_genre_returns_422(self, client, valid_employee_data):
-        """Invalid gender should return 422."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["genre"] = "Unknown"
-
-        response = client.post("/api/v1/predict", json=invalid_data)
-        assert response.status_code == 422
-
-    def test_predict_negative_salary_returns_422(self, client, valid_employee_data):
-        """Negative salary should return 422."""
-        invalid_data = valid_employee_data.copy()
-        invalid_data["revenu_mensuel"] = -1000
-
-        response = client.post("/api/v1/predict", json=invalid_data)
-        assert response.status_code == 422
-
-    def test_predict_consistency(self, client, valid_employee_data):
-        """Same input should produce same prediction."""
-        response1 = client.post("/api/v1/predict", json=valid_employee_data)
-        response2 = client.post("/api/v1/predict", json=valid_employee_data)
-
-        data1 = response1.json()
-        data2 = response2.json()
-
-        assert data1["prediction"]["will_leave"] == data2["prediction"]["will_leave"]
-        assert data1["prediction"]["probability_leave"] == data2["prediction"]["probability_leave"]
+        assert response.json()["prediction"] == real_prediction.json()["prediction"]
 
 
 # ===== Batch Prediction Endpoint Tests =====
@@ -236,147 +203,137 @@ class TestPredictEndpoint:
 class TestBatchPredictEndpoint:
     """Tests for batch prediction endpoint."""
 
-    def test_batch_predict_valid_input_returns_200(self, client, valid_employee_data):
+    async def test_batch_predict_valid_input_returns_200(self, batch2_response):
         """Valid batch prediction request should return 200."""
-        batch_data = {
-            "employees": [
-                {"employee_id": "EMP001", **valid_employee_data},
-                {"employee_id": "EMP002", **valid_employee_data},
-            ]
-        }
+        assert batch2_response.status_code == 200
 
-        response = client.post("/api/v1/predict/batch", json=batch_data)
-        assert response.status_code == 200
-
-    def test_batch_predict_response_format(self, client, valid_employee_data):
+    async def test_batch_predict_response_format(self, batch2_response):
         """Batch response should have correct format."""
-        batch_data = {
-            "employees": [
-                {"employee_id": "EMP001", **valid_employee_data},
-            ]
-        }
-
-        response = client.post("/api/v1/predict/batch", json=batch_data)
-        data = response.json()
+        data = batch2_response.json()
 
         assert "predictions" in data
         assert "metadata" in data
         assert isinstance(data["predictions"], list)
-        assert len(data["predictions"]) == 1
+        assert len(data["predictions"]) == 2
 
-    def test_batch_predict_includes_employee_ids(self, client, valid_employee_data):
+    async def test_batch_predict_includes_employee_ids(self, batch2_response):
         """Batch predictions should include employee IDs."""
-        batch_data = {
-            "employees": [
-                {"employee_id": "EMP001", **valid_employee_data},
-                {"employee_id": "EMP002", **valid_employee_data},
-            ]
-        }
-
-        response = client.post("/api/v1/predict/batch", json=batch_data)
-        data = response.json()
-
-        predictions = data["predictions"]
+        predictions = batch2_response.json()["predictions"]
         assert predictions[0]["employee_id"] == "EMP001"
         assert predictions[1]["employee_id"] == "EMP002"
 
-    def test_batch_predict_multiple_employees(self, client, valid_employee_data):
+    async def test_batch_predict_multiple_employees(self, async_client, valid_employee_data):
         """Batch should handle multiple different employees."""
-        employee1 = valid_employee_data.copy()
-        employee2 = valid_employee_data.copy()
-        employee2["age"] = 25
-        employee2["satisfaction_employee_environnement"] = 1
+        employee1 = valid_employee_data
+        employee2 = {**valid_employee_data, "age": 25, "satisfaction_employee_environnement": 1}
 
         batch_data = {
             "employees": [
-                {"employee_id": "EMP001", **employee1},
-                {"employee_id": "EMP002", **employee2},
+                {**employee1, "employee_id": "EMP001"},
+                {**employee2, "employee_id": "EMP002"},
             ]
         }
 
-        response = client.post("/api/v1/predict/batch", json=batch_data)
+        response = await async_client.post("/api/v1/predict/batch", json=batch_data)
         assert response.status_code == 200
 
         data = response.json()
         assert len(data["predictions"]) == 2
         assert data["metadata"]["total_predictions"] == 2
 
-    def test_batch_predict_empty_list_returns_422(self, client):
-        """Empty employee list should return 422."""
-        batch_data = {"employees": []}
 
-        response = client.post("/api/v1/predict/batch", json=batch_data)
-        assert response.status_code == 422
-
-    def test_batch_predict_missing_employee_id_returns_422(self, client, valid_employee_data):
-        """Batch item without employee_id should return 422."""
-        batch_data = {"employees": [valid_employee_data]}  # Missing employee_id
-
-        response = client.post("/api/v1/predict/batch", json=batch_data)
+# ===== Validation Error Tests =====
+
+
+class TestValidationErrors:
+    """Invalid requests should be rejected with 422 on both prediction endpoints."""
+
+    @pytest.mark.parametrize(
+        "mutator, endpoint",
+        [
+            (lambda d: {"age": 35}, "/api/v1/predict"),
+            (lambda d: {**d, "age": 17}, "/api/v1/predict"),
+            (lambda d: {**d, "genre": "Unknown"}, "/api/v1/predict"),
+            (lambda d: {**d, "revenu_mensuel": -1000}, "/api/v1/predict"),
+            (lambda d: {"employees": []}, "/api/v1/predict/batch"),
+            (lambda d: {"employees": [{k: v for k, v in d.items() if k != "employee_id"}]}, "/api/v1/predict/batch"),
+        ],
+        ids=[
+            "missing_fields",
+            "age_below_minimum",
+            "invalid_genre",
+            "negative_salary",
+            "batch_empty_list",
+            "batch_missing_employee_id",
+        ],
+    )
+    async def test_invalid_request_returns_422(self, async_client, valid_employee_data, mutator, endpoint):
+        """Each invalid payload should return 422."""
+        response = await async_client.post(endpoint, json=mutator(valid_employee_data))
         assert response.status_code == 422
 
 
 # ===== Edge Cases and Integration Tests =====
 
 
+@pytest.mark.real_model
 class TestEdgeCases:
     """Test edge cases and special scenarios."""
 
-    def test_predict_with_minimum_values(self, client, valid_employee_data):
+    async def test_predict_with_minimum_values(self, async_client, valid_employee_data):
         """Test prediction with minimum allowed values."""
-        min_data = valid_employee_data.copy()
-        min_data.update({
+        min_data = {
+            **valid_employee_data,
             "age": 18,
             "revenu_mensuel": 0.01,
             "satisfaction_employee_environnement": 1,
             "note_evaluation_actuelle": 1,
-        })
+        }
 
-        response = client.post("/api/v1/predict", json=min_data)
+        response = await async_client.post("/api/v1/predict", json=min_data)
         assert response.status_code == 200
 
-    def test_predict_with_maximum_values(self, client, valid_employee_data):
+    async def test_predict_with_maximum_values(self, async_client, valid_employee_data):
         """Test prediction with maximum allowed values."""
-        max_data = valid_employee_data.copy()
-        max_data.update({
+        max_data = {
+            **valid_employee_data,
             "age": 70,
             "satisfaction_employee_environnement": 5,
             "note_evaluation_actuelle": 4,
-        })
+        }
 
-        response = client.post("/api/v1/predict", json=max_data)
+        response = await async_client.post("/api/v1/predict", json=max_data)
         assert response.status_code == 200
 
-    def test_predict_with_special_characters(self, client, valid_employee_data):
+    async def test_predict_with_special_characters(self, async_client, valid_employee_data):
         """Test that special characters in text fields are handled."""
-        special_data = valid_employee_data.copy()
-        special_data.update({
+        special_data = {
+            **valid_employee_data,
             "poste": "Développeur Sénior",
             "departement": "Recherche & Développement",
             "domaine_etude": "Sciences de l'ingénieur",
-        })
+        }
 
-        response = client.post("/api/v1/predict", json=special_data)
+        response = await async_client.post("/api/v1/predict", json=special_data)
         assert response.status_code == 200
 
-    def test_predict_with_french_categorical_values(self, client, valid_employee_data):
+    async def test_predict_with_french_categorical_values(self, async_client, valid_employee_data):
         """Test with French categorical value variants."""
-        french_data = valid_employee_data.copy()
-        french_data.update({
+        french_data = {
+            **valid_employee_data,
             "genre": "Homme",
             "statut_marital": "Marié",
-        })
+        }
 
-        response = client.post("/api/v1/predict", json=french_data)
+        response = await async_client.post("/api/v1/predict", json=french_data)
         assert response.status_code == 200
 
-    def test_risk_level_categorization(self, client, valid_employee_data):
+    async def test_risk_level_categorization(self, real_prediction):
         """Test that risk levels are properly categorized."""
         # Create different employee profiles that should have different risk levels
         # Note: Actual predictions depend on the model, but we can verify the mapping works
 
-        response = client.post("/api/v1/predict", json=valid_employee_data)
-        data = response.json()
+        data = real_prediction.json()
 
         prob = data["prediction"]["probability_leave"]
         risk = data["prediction"]["risk_level"]
@@ -390,57 +347,38 @@ class TestEdgeCases:
             assert risk == "HIGH"
 
 
-# ===== Performance Tests =====
-
-
-class TestPerformance:
-    """Test API performance characteristics."""
-
-    def test_prediction_time_is_reasonable(self, client, valid_employee_data):
-        """Prediction should complete in reasonable time."""
-        response = client.post("/api/v1/predict", json=valid_employee_data)
-        data = response.json()
-
-        prediction_time = data["metadata"]["prediction_time_ms"]
-        assert prediction_time < 1000  # Should be under 1 second
-
-    def test_batch_prediction_time_scales(self, client, valid_employee_data):
-        """Batch predictions should be reasonably fast."""
-        batch_data = {
-            "employees": [
-                {"employee_id": f"EMP{i:03d}", **valid_employee_data}
-                for i in range(10)
-            ]
-        }
+# ===== Root Endpoint Tests =====
 
-        response = client.post("/api/v1/predict/batch", json=batch_data)
-        data = response.json()
 
-        prediction_time = data["metadata"]["prediction_time_ms"]
-        assert prediction_time < 5000  # 10 predictions should complete in under 5 seconds
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def root_response(async_client):
+    """Landing page response, fetched once for the read-only root tests."""
+    return await async_client.get("/")
 
 
-# ===== Root Endpoint Tests =====
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def openapi_spec(async_client):
+    """Decoded OpenAPI document, generated once per module."""
+    response = await async_client.get("/openapi.json")
+    assert response.status_code == 200
+    return response.json()
 
 
 class TestRootEndpoint:
     """Tests for the landing page endpoint."""
 
-    def test_root_returns_200(self, client):
+    async def test_root_returns_200(self, root_response):
         """Root endpoint should return 200."""
-        response = client.get("/")
-        assert response.status_code == 200
+        assert root_response.status_code == 200
 
-    def test_root_returns_html(self, client):
+    async def test_root_returns_html(self, root_response):
         """Root endpoint should return HTML content."""
-        response = client.get("/")
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
+        assert root_response.status_code == 200
+        assert "text/html" in root_response.headers["content-type"]
 
-    def test_root_contains_key_elements(self, client):
+    async def test_root_contains_key_elements(self, root_response):
         """Landing page should contain key information."""
-        response = client.get("/")
-        content = response.text
+        content = root_response.text
 
         # Check for main heading and branding
         assert "HR Attrition Prediction API" in content
@@ -458,16 +396,14 @@ class TestRootEndpoint:
         # Check for GitHub link
         assert "github.com/ghislaindelabie/oc5-deploy-ml" in content
 
-    def test_root_has_cache_headers(self, client):
+    async def test_root_has_cache_headers(self, root_response):
         """Root endpoint should include caching headers."""
-        response = client.get("/")
-        assert "cache-control" in response.headers
-        assert "max-age" in response.headers["cache-control"]
+        assert "cache-control" in root_response.headers
+        assert "max-age" in root_response.headers["cache-control"]
 
-    def test_root_is_valid_html(self, client):
+    async def test_root_is_valid_html(self, root_response):
         """Landing page should be valid HTML."""
-        response = client.get("/")
-        content = response.text
+        content = root_response.text
 
         # Check for basic HTML structure
         assert "<!DOCTYPE html>" in content
@@ -476,11 +412,7 @@ class TestRootEndpoint:
         assert "<body>" in content
         assert "</html>" in content
 
-    def test_root_not_in_openapi_schema(self, client):
+    async def test_root_not_in_openapi_schema(self, openapi_spec):
         """Root endpoint should not appear in OpenAPI schema."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-
-        openapi_spec = response.json()
         # The root path "/" should not be in the paths
         assert "/" not in openapi_spec.get("paths", {})
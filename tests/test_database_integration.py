@@ -4,16 +4,26 @@ Database integration tests - minimal viable coverage.
 These tests provide core database safety guarantees:
 1. Database connection works
 2. API still works if database fails (graceful degradation)
+3. Bulk inserts write linked prediction rows (rolled back after the test)
+4. Explicit prediction dates are stored exactly (no wall-clock dependency)
 
 NOTE: Tests that required coordinating async_client + db_session fixtures
 were removed due to event loop conflicts. Database logging is manually verified.
+All tests in this module run on the session event loop, shared with
+async_client, so pooled connections can be reused between them.
 
 Run locally with: pytest -m database
 Skip with: pytest -m "not database" (default)
 """
+import asyncio
+from datetime import datetime, timezone
+
 import pytest
-from sqlalchemy import select, func
-from oc5_ml_deployment.database import DATABASE_ENABLED, engine, APIRequest
+import pytest_asyncio
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from oc5_ml_deployment.database import DATABASE_ENABLED, engine, APIRequest, Prediction, crud
+from oc5_ml_deployment.database.database import POOL_SIZE
 
 # Skip all tests in this file if database not configured
 pytestmark = [
@@ -22,62 +32,126 @@ pytestmark = [
         not DATABASE_ENABLED,
         reason="Database tests require OC5_DATABASE_URL to be set"
     ),
+    pytest.mark.xdist_group(name="db"),
+    pytest.mark.asyncio(loop_scope="session"),
+    pytest.mark.usefixtures("warm_model"),
 ]
 
+# Count statements, built once and reused (filters are added per test)
+_COUNT_REQUESTS = select(func.count()).select_from(APIRequest)
+_COUNT_PREDICTIONS = select(func.count()).select_from(Prediction)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session", autouse=True)
+async def _warm_pool():
+    """Open the pool's permanent connections once for the whole module.
 
-@pytest.fixture
+    Tests share the session event loop, so connections returned to the pool
+    by one test are reused by the next instead of reconnecting each time.
+    The engine is disposed afterwards to release them.
+    """
+    conns = await asyncio.gather(*(engine.connect() for _ in range(POOL_SIZE)))
+    await asyncio.gather(*(conn.close() for conn in conns))
+    yield
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
 async def db_session():
-    """Provide a clean database session for testing."""
-    from sqlalchemy.ext.asyncio import AsyncSession
+    """Provide a database session whose writes are rolled back after the test.
 
-    async with AsyncSession(engine) as session:
-        yield session
+    The session joins an outer transaction on a dedicated connection, so
+    commit() only releases a savepoint and nothing is durably written. Use
+    flush() to make inserted rows visible to later queries in the test.
+    Statements running longer than 5 seconds are cancelled by the server.
+    """
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        # Fail fast on a slow or stuck query (reset when the transaction ends)
+        await conn.execute(text("SET LOCAL statement_timeout = '5s'"))
+        async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as session:
+            yield session
+        await trans.rollback()
 
 
-@pytest.mark.asyncio
 async def test_database_connection(db_session):
     """Verify database connection works."""
-    result = await db_session.execute(select(func.count()).select_from(APIRequest))
+    result = await db_session.execute(_COUNT_REQUESTS)
     count = result.scalar()
     assert count is not None
     assert count >= 0
 
 
-@pytest.mark.asyncio
-async def test_database_error_doesnt_break_prediction(async_client):
+async def test_bulk_insert_predictions_links_rows_to_request(db_session):
+    """Verify predictions inserted in one statement are linked to their request."""
+    [request_id] = await crud.bulk_insert_api_requests(db_session, [{
+        "endpoint": "/api/v1/predict/batch",
+        "request_data": {"employees": 5},
+        "client_ip": None,
+        "user_agent": "pytest",
+        "http_status": 200,
+        "response_time_ms": 1,
+    }])
+    now = datetime.now(timezone.utc)
+    ids = [f"TEST_{i:03d}" for i in range(5)]
+    await crud.bulk_insert_predictions(db_session, [
+        {
+            "request_id": request_id,
+            "employee_id": employee_id,
+            "attrition_prob": 0.3 + i * 0.1,
+            "risk_level": "MEDIUM",
+            "model_version": "test_v1.0",
+            "prediction_date": now,
+            "features_snapshot": {"age": 30 + i},
+        }
+        for i, employee_id in enumerate(ids)
+    ])
+    await db_session.flush()
+
+    result = await db_session.execute(
+        select(Prediction.employee_id).where(Prediction.request_id == request_id)
+    )
+    assert set(result.scalars().all()) == set(ids)
+
+
+async def test_get_predictions_by_exact_date(db_session):
+    """Verify an explicit prediction_date is stored as-is and matches by equality."""
+    fixed = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    api_request = await crud.create_api_request(
+        db_session,
+        endpoint="/api/v1/predict",
+        request_data={"employee_id": "TEST_DATE"},
+        client_ip=None,
+        user_agent="pytest",
+        http_status=200,
+        response_time_ms=1,
+    )
+    await crud.create_prediction(
+        db_session,
+        request_id=api_request.id,
+        employee_id="TEST_DATE",
+        attrition_prob=0.4,
+        risk_level="MEDIUM",
+        model_version="test_v1.0",
+        prediction_date=fixed,
+    )
+
+    result = await db_session.execute(
+        _COUNT_PREDICTIONS.where(
+            Prediction.request_id == api_request.id,
+            Prediction.prediction_date == fixed,
+        )
+    )
+    assert result.scalar() == 1
+
+
+async def test_database_error_doesnt_break_prediction(async_client, valid_employee_data):
     """Verify API still works even if database logging fails."""
     # This test verifies graceful degradation
     # (Hard to test without actually breaking DB, but validates error handling exists)
 
-    sample_data = {
-        "employee_id": "TEST_001",
-        "age": 35,
-        "genre": "Male",
-        "statut_marital": "Married",
-        "departement": "Sales",
-        "poste": "Sales Executive",
-        "domaine_etude": "Life Sciences",
-        "revenu_mensuel": 5000,
-        "nombre_experiences_precedentes": 3,
-        "nombre_heures_travailless": 40,
-        "annees_dans_le_poste_actuel": 2,
-        "satisfaction_employee_environnement": 4,
-        "note_evaluation_precedente": 3,
-        "satisfaction_employee_nature_travail": 4,
-        "satisfaction_employee_equipe": 3,
-        "satisfaction_employee_equilibre_pro_perso": 3,
-        "note_evaluation_actuelle": 3,
-        "nombre_participation_pee": 1,
-        "nb_formations_suivies": 2,
-        "nombre_employee_sous_responsabilite": 0,
-        "distance_domicile_travail": 10,
-        "niveau_education": 3,
-        "annees_depuis_la_derniere_promotion": 1,
-        "annes_sous_responsable_actuel": 2,
-        "heure_supplementaires": "No",
-    }
-
-    response = await async_client.post("/api/v1/predict", json=sample_data)
+    response = await async_client.post("/api/v1/predict", json=dict(valid_employee_data))
     assert response.status_code == 200
-    assert "prediction" in response.json()
-    assert "metadata" in response.json()
+    data = response.json()
+    assert "prediction" in data
+    assert "metadata" in data
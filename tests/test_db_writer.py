@@ -0,0 +1,221 @@
+"""
+Tests for the background database writer.
+
+Uses a fake session factory and stubbed bulk inserts so batching and
+lifecycle can be checked without a database connection.
+"""
+import asyncio
+
+import pytest
+
+from oc5_ml_deployment.database import writer
+
+
+class FakeSession:
+    """Minimal stand-in for AsyncSession counting commits."""
+
+    commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        FakeSession.commits += 1
+
+
+@pytest.fixture(autouse=True)
+def _fresh_writer(monkeypatch):
+    """Give each test its own writer state.
+
+    Leaves any writer started by the app lifespan (session async_client)
+    untouched, and restores it afterwards.
+    """
+    monkeypatch.setattr(writer, "_queue", None)
+    monkeypatch.setattr(writer, "_task", None)
+
+
+@pytest.fixture
+def inserted(monkeypatch):
+    """Enable the writer against FakeSession and record bulk-inserted rows."""
+    rows = {"api_requests": [], "predictions": []}
+
+    async def fake_bulk_insert_api_requests(session, batch):
+        if any(r["request_data"].get("bad") for r in batch):
+            raise ValueError("value too long for type character varying(50)")
+        rows["api_requests"].append(batch)
+
+    async def fake_bulk_insert_predictions(session, batch):
+        rows["predictions"].append(batch)
+
+    FakeSession.commits = 0
+    monkeypatch.setattr(writer.database, "DATABASE_ENABLED", True)
+    monkeypatch.setattr(writer.database, "AsyncSessionLocal", FakeSession)
+    monkeypatch.setattr(writer.crud, "bulk_insert_api_requests", fake_bulk_insert_api_requests)
+    monkeypatch.setattr(writer.crud, "bulk_insert_predictions", fake_bulk_insert_predictions)
+    return rows
+
+
+def _entry(i, bad=False):
+    api_request = {
+        "endpoint": "/api/v1/predict",
+        "request_data": {"i": i, "bad": bad},
+        "client_ip": None,
+        "user_agent": None,
+        "http_status": 200,
+        "response_time_ms": 1,
+    }
+    predictions = [{
+        "employee_id": f"EMP{i:03d}",
+        "attrition_prob": 0.3,
+        "risk_level": "LOW",
+        "model_version": "test",
+        "prediction_date": None,
+        "features_snapshot": None,
+    }]
+    return api_request, predictions
+
+
+def test_enqueue_without_running_writer_is_dropped():
+    """Enqueue is a no-op when the writer has not been started."""
+    assert writer.enqueue(*_entry(0)) is False
+
+
+async def test_pending_entries_are_flushed_in_one_batch_on_stop(inserted):
+    """Entries queued before shutdown are written together in a single commit."""
+    await writer.start()
+    for i in range(3):
+        assert writer.enqueue(*_entry(i)) is True
+    await writer.stop()
+
+    assert FakeSession.commits == 1
+    [requests] = inserted["api_requests"]
+    [predictions] = inserted["predictions"]
+    assert [r["request_data"]["i"] for r in requests] == [0, 1, 2]
+    # Predictions are linked to the pre-assigned request IDs
+    assert [p["request_id"] for p in predictions] == [r["id"] for r in requests]
+
+
+async def test_entries_are_flushed_after_flush_interval(inserted):
+    """A partial batch is written once FLUSH_INTERVAL_S elapses, without waiting for stop."""
+    await writer.start()
+    writer.enqueue(*_entry(0))
+    await asyncio.sleep(writer.FLUSH_INTERVAL_S * 4)
+
+    assert FakeSession.commits == 1
+    await writer.stop()
+    assert FakeSession.commits == 1
+
+
+async def test_batches_are_split_at_batch_max_rows(inserted, monkeypatch):
+    """A batch stops growing once it reaches BATCH_MAX_ROWS rows."""
+    monkeypatch.setattr(writer, "BATCH_MAX_ROWS", 4)  # 2 entries (request + prediction each)
+    await writer.start()
+    for i in range(3):
+        writer.enqueue(*_entry(i))
+    await writer.stop()
+
+    assert FakeSession.commits == 2
+    assert [[r["request_data"]["i"] for r in b] for b in inserted["api_requests"]] == [[0, 1], [2]]
+
+
+async def test_enqueue_drops_entry_when_queue_is_full(inserted, monkeypatch):
+    """Enqueue returns False instead of blocking when the queue is full."""
+    monkeypatch.setattr(writer, "QUEUE_MAXSIZE", 1)
+    await writer.start()
+    assert writer.enqueue(*_entry(0)) is True
+    assert writer.enqueue(*_entry(1)) is False
+    await writer.stop()
+
+    [requests] = inserted["api_requests"]
+    assert [r["request_data"]["i"] for r in requests] == [0]
+
+
+async def test_failed_batch_is_retried_entry_by_entry(inserted):
+    """A bad entry only loses its own log; the rest of its batch is still written."""
+    await writer.start()
+    writer.enqueue(*_entry(0))
+    writer.enqueue(*_entry(1, bad=True))
+    writer.enqueue(*_entry(2))
+    await writer.stop()
+
+    assert [[r["request_data"]["i"] for r in b] for b in inserted["api_requests"]] == [[0], [2]]
+    assert FakeSession.commits == 2
+
+
+async def test_consumer_survives_failed_batch(inserted):
+    """Entries queued after a failed write are still written."""
+    await writer.start()
+    writer.enqueue(*_entry(0, bad=True))
+    await asyncio.sleep(writer.FLUSH_INTERVAL_S * 4)
+    assert inserted["api_requests"] == []
+
+    writer.enqueue(*_entry(1))
+    await writer.stop()
+
+    [requests] = inserted["api_requests"]
+    assert [r["request_data"]["i"] for r in requests] == [1]
+
+
+async def test_stop_does_not_hang_when_consumer_is_dead(inserted, monkeypatch, caplog):
+    """A full queue with no consumer is dropped (and reported) instead of blocking stop()."""
+    monkeypatch.setattr(writer, "QUEUE_MAXSIZE", 2)
+    await writer.start()
+    writer._task.cancel()
+    await asyncio.sleep(0)
+    writer.enqueue(*_entry(0))
+    writer.enqueue(*_entry(1))
+
+    await asyncio.wait_for(writer.stop(), 1)
+
+    assert writer._task is None and writer._queue is None
+    assert inserted["api_requests"] == []
+    assert "dropping 2 log entries" in caplog.text
+
+
+async def test_stop_gives_up_when_queue_stays_full(inserted, monkeypatch, caplog):
+    """If the consumer is stuck, stop() times out waiting for room and cancels it."""
+    stuck = asyncio.Event()
+
+    async def blocked_bulk_insert(session, batch):
+        stuck.set()
+        await asyncio.Event().wait()  # Never returns
+
+    monkeypatch.setattr(writer.crud, "bulk_insert_api_requests", blocked_bulk_insert)
+    monkeypatch.setattr(writer, "QUEUE_MAXSIZE", 1)
+    monkeypatch.setattr(writer, "STOP_TIMEOUT_S", 0.05)
+    await writer.start()
+    writer.enqueue(*_entry(0))
+    await stuck.wait()
+    writer.enqueue(*_entry(1))  # Fills the queue behind the stuck write
+
+    await asyncio.wait_for(writer.stop(), 1)
+
+    assert writer._task is None and writer._queue is None
+    assert "dropping 1 log entries" in caplog.text
+
+
+class RecordingSession:
+    """Minimal stand-in for AsyncSession recording executed statements."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+async def test_bulk_insert_leaves_caller_rows_untouched():
+    """IDs are assigned on copies, so reusing a row list inserts fresh primary keys."""
+    rows = [_entry(0)[0], _entry(1)[0]]
+    original = [dict(r) for r in rows]
+    session = RecordingSession()
+
+    first_ids = await writer.crud.bulk_insert_api_requests(session, rows)
+    second_ids = await writer.crud.bulk_insert_api_requests(session, rows)
+
+    assert rows == original
+    assert len(set(first_ids + second_ids)) == 4
+    assert len(session.statements) == 2
@@ -1,10 +1,37 @@
 """Tests for SHAP explanation endpoint."""
 import pytest
 
+pytestmark = pytest.mark.usefixtures("warm_model")
 
-def test_explain_endpoint_success(client, valid_employee_data):
+# Overrides applied to valid_employee_data, one explanation request each
+HIGH_RISK = {
+    "age": 22,
+    "revenu_mensuel": 1200,
+    "satisfaction_employee_environnement": 1,
+    "satisfaction_employee_equilibre_pro_perso": 1,
+    "heure_supplementaires": "Yes",
+}
+LOW_RISK = {
+    "age": 45,
+    "revenu_mensuel": 15000,
+    "satisfaction_employee_environnement": 4,
+    "satisfaction_employee_equilibre_pro_perso": 4,
+    "heure_supplementaires": "No",
+}
+EDGE = {
+    "age": 18,
+    "revenu_mensuel": 1,
+    "nombre_experiences_precedentes": 0,
+    "annees_dans_le_poste_actuel": 0,
+}
+
+
+@pytest.mark.parametrize(
+    "profile", [{}, HIGH_RISK, LOW_RISK, EDGE], ids=["default", "high_risk", "low_risk", "edge"]
+)
+def test_explain_endpoint_success(client, valid_employee_data, profile):
     """Test that explain endpoint returns top 5 features."""
-    response = client.post("/api/v1/explain", json=valid_employee_data)
+    response = client.post("/api/v1/explain", json={**valid_employee_data, **profile})
 
     assert response.status_code == 200
     data = response.json()
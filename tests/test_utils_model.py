@@ -0,0 +1,164 @@
+"""
+Equivalence tests for the training helpers in src/utils_model.py.
+
+Each optimized helper is checked against the straightforward sklearn /
+imblearn computation it replaces.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import f1_score, precision_score, recall_score
+
+from utils_model import (
+    FastMedianImputer,
+    LazySMOTENC,
+    _indicator_columns,
+    _threshold_table,
+    make_preprocessor,
+)
+
+
+# ===== Threshold sweep =====
+
+
+def test_threshold_table_matches_per_threshold_metrics():
+    """One precision_recall_curve pass gives the same metrics as scoring each threshold."""
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 300)
+    scores = np.round(rng.random(300), 2)  # rounded: many ties
+    # Exact score values, boundaries and out-of-range thresholds
+    thresholds = [-0.1, 0.0, 0.2, scores[0], 0.35, 0.5, scores.max(), 0.999, 1.0, 1.5]
+
+    table = _threshold_table(y, scores, thresholds)
+
+    for row in table.itertuples():
+        yhat = (scores >= row.threshold).astype(int)
+        assert row.precision == pytest.approx(precision_score(y, yhat, zero_division=0))
+        assert row.recall == pytest.approx(recall_score(y, yhat, zero_division=0))
+        assert row.f1 == pytest.approx(f1_score(y, yhat, zero_division=0))
+
+
+# ===== Median imputation =====
+
+
+def test_fast_median_imputer_matches_simple_imputer():
+    """FastMedianImputer fills the same medians as SimpleImputer(strategy="median")."""
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(40, 4)), columns=list("abcd"))
+    X = X.mask(rng.random(X.shape) < 0.25)  # even and odd non-missing counts per column
+
+    expected = SimpleImputer(strategy="median").fit(X)
+    fast = FastMedianImputer().fit(X)
+
+    np.testing.assert_array_equal(fast.statistics_, expected.statistics_)
+    np.testing.assert_array_equal(fast.transform(X), expected.transform(X))
+    np.testing.assert_array_equal(fast.get_feature_names_out(), expected.get_feature_names_out())
+
+
+def test_fast_median_imputer_keeps_all_nan_columns():
+    """All-NaN columns are kept and filled with 0 (SimpleImputer would drop them)."""
+    X = np.array([[1.0, np.nan], [3.0, np.nan]])
+
+    out = FastMedianImputer().fit_transform(X)
+
+    np.testing.assert_array_equal(out, [[1.0, 0.0], [3.0, 0.0]])
+
+
+def test_fast_median_imputer_rejects_mismatched_columns():
+    """Reordered or missing columns raise instead of silently getting the wrong medians."""
+    X = pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": [10.0, 20.0, np.nan]})
+    imputer = FastMedianImputer().fit(X)
+
+    with pytest.raises(ValueError, match="feature names"):
+        imputer.transform(X[["b", "a"]])
+    with pytest.raises(ValueError, match="features"):
+        FastMedianImputer().fit(X.to_numpy()).transform(X[["a"]].to_numpy())
+
+
+def test_fast_median_imputer_does_not_modify_input():
+    """transform fills a copy, even when the input is already float64."""
+    X = np.array([[1.0, np.nan], [np.nan, 4.0]])
+
+    FastMedianImputer().fit(X).transform(X)
+
+    assert np.isnan(X).sum() == 2
+
+# ===== Multi-valued column binarization =====
+
+
+def _dense(X):
+    """ColumnTransformer returns dense output when the result is not sparse enough."""
+    return X.toarray() if sparse.issparse(X) else X
+
+
+def _multi_label_frames():
+    """Same labels as comma-separated strings and as pre-split lists (no repeats per row)."""
+    labels = ["email", "chat", "video call", "phone"]
+    rng = np.random.default_rng(2)
+    lists = [list(rng.choice(labels, size=rng.integers(1, 4), replace=False)) for _ in range(60)]
+    as_text = pd.DataFrame({"tools": [", ".join(cell) for cell in lists]})
+    as_lists = pd.DataFrame({"tools": pd.Series(lists, dtype=object)})
+    # Missing cells in both representations
+    as_text.loc[[3, 7], "tools"] = np.nan
+    as_lists.loc[[3, 7], "tools"] = np.nan
+    return as_text, as_lists
+
+
+@pytest.mark.parametrize("max_features", [30, 2])
+def test_already_split_path_matches_comma_separated_path(max_features):
+    """_MLBTransformer on lists gives the same matrix and names as CountVectorizer on text."""
+    as_text, as_lists = _multi_label_frames()
+    kwargs = dict(multi_list_col="tools", multi_max_features=max_features, prep_n_jobs=1)
+
+    text_prep = make_preprocessor([], [], **kwargs).fit(as_text)
+    list_prep = make_preprocessor([], [], already_split=True, **kwargs).fit(as_lists)
+
+    np.testing.assert_array_equal(
+        _dense(list_prep.transform(as_lists)), _dense(text_prep.transform(as_text))
+    )
+    np.testing.assert_array_equal(list_prep.get_feature_names_out(), text_prep.get_feature_names_out())
+
+
+# ===== SMOTE resampling =====
+
+
+def test_indicator_columns_agree_on_dense_and_sparse_input():
+    """Indicator columns are detected the same way on dense and CSR matrices."""
+    X = np.array([
+        [0.0, 1.0, 0.5, 0.0],
+        [1.0, 0.0, 2.0, 0.0],
+        [1.0, 1.0, 0.0, 3.0],
+    ])
+
+    expected = [True, True, False, False]
+    np.testing.assert_array_equal(_indicator_columns(X), expected)
+    np.testing.assert_array_equal(_indicator_columns(sparse.csr_matrix(X)), expected)
+
+
+def test_lazy_smotenc_matches_smote_on_numeric_data():
+    """Without indicator columns, LazySMOTENC resamples exactly like SMOTE."""
+    from imblearn.over_sampling import SMOTE
+
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(60, 3))
+    y = np.r_[np.zeros(50, dtype=int), np.ones(10, dtype=int)]
+
+    X_lazy, y_lazy = LazySMOTENC(k_neighbors=3, random_state=42).fit_resample(X, y)
+    X_smote, y_smote = SMOTE(k_neighbors=3, random_state=42).fit_resample(X, y)
+
+    np.testing.assert_array_equal(X_lazy, X_smote)
+    np.testing.assert_array_equal(y_lazy, y_smote)
+
+
+def test_lazy_smotenc_keeps_indicator_columns_binary():
+    """Synthetic samples get valid 0/1 values in the detected indicator columns."""
+    rng = np.random.default_rng(4)
+    X = np.column_stack([rng.normal(size=60), rng.integers(0, 2, size=(60, 2))]).astype(float)
+    y = np.r_[np.zeros(50, dtype=int), np.ones(10, dtype=int)]
+
+    X_res, y_res = LazySMOTENC(k_neighbors=3, random_state=42).fit_resample(X, y)
+
+    assert np.bincount(y_res).tolist() == [50, 50]
+    assert np.isin(X_res[:, 1:], [0.0, 1.0]).all()